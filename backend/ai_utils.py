@@ -1,17 +1,39 @@
 import os
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
 from langchain_core.prompts import PromptTemplate
-from typing import List, Dict
-import pypdf
-from io import BytesIO
+from typing import List, Dict, Any, Optional, NamedTuple, Tuple
 import time
 import json
+import asyncio
+import threading
 from pydantic import BaseModel, Field
 from .schemas import ResumeData, Project, Education, Experience, SkillCategory
+from . import llm_cache, rate_limit, pdf_text
 
 os.environ["USER_AGENT"] = "AIResumeMaker/1.0"
 
+GEMINI_MODEL = "gemini-2.5-flash"
+# "gemini" (default) or "fake" for the offline stand-in in fake_llm.py.
+AI_BACKEND = os.getenv("AI_BACKEND", "gemini").lower()
+
+def get_api_key():
+    """The Gemini key, or a placeholder when the fake backend doesn't need one."""
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key and AI_BACKEND == "fake":
+        return "fake-api-key"
+    return api_key
+
+# --- Resume Parsing Configuration ---
+# Each upload runs two LLM extractions side by side, each against its own deadline.
+PARSE_MAIN_TIMEOUT_SECONDS = float(os.getenv("PARSE_MAIN_TIMEOUT_SECONDS", "60"))
+PARSE_SKILLS_TIMEOUT_SECONDS = float(os.getenv("PARSE_SKILLS_TIMEOUT_SECONDS", "45"))
+
+# --- Async Configuration ---
+# Upper bound on in-flight LLM calls made through the async API on one worker's event loop.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "200"))
+_llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
 class SkillListInternal(BaseModel):
     skills: List[SkillCategory]
 
@@ -23,160 +45,416 @@ class ProjectDetails(BaseModel):
 class SuggestedProjects(BaseModel):
     projects: List[ProjectDetails]
 
-def _invoke_with_retry(chain, params):
-    max_retries = 3
-    delay = 2
-    for attempt in range(max_retries):
+def _is_error(response):
+    return isinstance(response, dict) and "error" in response
+
+QUOTA_ERROR = {"error": "API quota limit reached. Please try again in a few minutes."}
+MAX_RETRIES = 3
+
+async def _ainvoke_with_retry(chain, params, priority=rate_limit.PRIORITY_DEFAULT):
+    limiter = rate_limit.get_limiter()
+    for attempt in range(MAX_RETRIES):
+        try:
+            await limiter.aacquire(priority)
+        except rate_limit.RateLimitExceeded as e:
+            print(f"Rate limiter rejected the call: {e}")
+            return dict(QUOTA_ERROR)
         try:
-            return chain.invoke(params)
+            async with _llm_semaphore:
+                response = await chain.ainvoke(params)
         except Exception as e:
-            if "Quota exceeded" in str(e) or "429" in str(e):
-                if attempt < max_retries - 1:
-                    print(f"Rate limit exceeded. Retrying in {delay} seconds...")
-                    time.sleep(delay)
-                    delay *= 2
-                else:
-                    return {"error": "API quota limit reached. Please try again in a few minutes."}
-            else:
-                print(f"An unexpected error occurred: {e}")
-                return {"error": f"An unexpected error occurred: {e}"}
+            if rate_limit.is_rate_limit_error(e):
+                delay = limiter.record_throttle(e, attempt)
+                if attempt < MAX_RETRIES - 1:
+                    print(f"Rate limit exceeded. Retrying in {delay:.1f} seconds...")
+                    await asyncio.sleep(delay)
+                    continue
+                return dict(QUOTA_ERROR)
+            print(f"An unexpected error occurred: {e}")
+            return {"error": f"An unexpected error occurred: {e}"}
+        limiter.record_success()
+        return response
     return {"error": "Failed after multiple retries."}
 
-def _parse_skills(resume_text: str, api_key: str) -> List[Dict[str, str]]:
-    try:
-        llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", google_api_key=api_key, temperature=0.0)
-        parser = JsonOutputParser(pydantic_object=SkillListInternal)
-        template = """Extract the skills from the resume text and categorize them into logical groups.
+# --- Response Cache Plumbing ---
+def _parser_schema(parser):
+    pydantic_object = getattr(parser, "pydantic_object", None)
+    if pydantic_object is not None:
+        return json.dumps(pydantic_object.model_json_schema(), sort_keys=True)
+    return type(parser).__name__
+
+def _cache_key(compiled, params, allow_nonzero_temperature):
+    """Returns the cache key for this call, or None when the call must bypass the cache."""
+    temperature = getattr(compiled.llm, "temperature", None) or 0.0
+    if not llm_cache.get_response_cache().should_cache(temperature, allow_nonzero_temperature):
+        return None
+    model = getattr(compiled.llm, "model", None) or type(compiled.llm).__name__
+    return llm_cache.make_cache_key(model, temperature, compiled.prompt.format(**params), compiled.schema)
+
+# The cache's SQLite tier locks and does disk I/O, so lookups and stores run off the event loop.
+async def _ainvoke_cached(compiled, params, allow_nonzero_temperature=False, refresh=False):
+    """Runs a compiled chain, serving repeat calls from the response cache (refresh=True skips the lookup)."""
+    cache = llm_cache.get_response_cache()
+    key = _cache_key(compiled, params, allow_nonzero_temperature)
+    if key is not None and not refresh:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            return cached
+    response = await _ainvoke_with_retry(compiled.chain, params, compiled.priority)
+    if key is not None:
+        await asyncio.to_thread(cache.set, key, response)
+    return response
+
+# --- Prompt Builders ---
+# Each returns (prompt, parser) with the parser's format instructions already rendered into the prompt.
+def _skills_prompt():
+    parser = JsonOutputParser(pydantic_object=SkillListInternal)
+    template = """Extract the skills from the resume text and categorize them into logical groups.
 {format_instructions}
 RESUME TEXT:
 {resume_text}
 """
-        prompt = PromptTemplate(template=template, input_variables=["resume_text"], partial_variables={"format_instructions": parser.get_format_instructions()})
-        chain = prompt | llm | parser
-        response = _invoke_with_retry(chain, {"resume_text": resume_text})
-        if isinstance(response, dict) and "error" in response:
-            return []
-        return response.get('skills', [])
-    except Exception as e:
-        print(f"Error in _parse_skills: {e}")
-        return []
+    prompt = PromptTemplate(template=template, input_variables=["resume_text"], partial_variables={"format_instructions": parser.get_format_instructions()})
+    return prompt, parser
 
-def parse_resume_from_pdf(pdf_bytes: bytes):
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key: return {"error": "GOOGLE_API_KEY not set."}
-    try:
-        pdf_reader = pypdf.PdfReader(BytesIO(pdf_bytes))
-        resume_text = "".join([page.extract_text() or "" for page in pdf_reader.pages])
-        llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", google_api_key=api_key, temperature=0.0)
-        main_parser = JsonOutputParser(pydantic_object=ResumeData)
-        main_prompt_template = """You are an expert resume parser. Analyze the resume text and extract the information into a structured JSON object.
+def _resume_prompt():
+    main_parser = JsonOutputParser(pydantic_object=ResumeData)
+    main_prompt_template = """You are an expert resume parser. Analyze the resume text and extract the information into a structured JSON object.
 Pay close attention to all sections EXCEPT for skills.
 {format_instructions}
 RESUME TEXT:
 {resume_text}
 """
-        main_prompt = PromptTemplate(template=main_prompt_template, input_variables=["resume_text"], partial_variables={"format_instructions": main_parser.get_format_instructions()})
-        main_chain = main_prompt | llm | main_parser
-        parsed_data = _invoke_with_retry(main_chain, {"resume_text": resume_text})
-
-        if isinstance(parsed_data, dict) and "error" in parsed_data:
-            return parsed_data
-        # Separately parse skills
-        parsed_skills = _parse_skills(resume_text, api_key)
-        parsed_data['skills'] = parsed_skills
-
-        # Ensure all schema fields correct type and present
-        for field, field_type in ResumeData.__annotations__.items():
-            if field not in parsed_data:
-                if str(field_type).startswith("typing.List"):
-                    parsed_data[field] = []
-                else:
-                    parsed_data[field] = ""
-            # Fix leetcode field (should never be list)
-            if field == "leetcode" and not isinstance(parsed_data[field], str):
-                parsed_data[field] = ""
+    main_prompt = PromptTemplate(template=main_prompt_template, input_variables=["resume_text"], partial_variables={"format_instructions": main_parser.get_format_instructions()})
+    return main_prompt, main_parser
 
-        return parsed_data
-    except Exception as e:
-        print(f"Error in parse_resume_from_pdf: {e}")
-        return {"error": f"Failed to parse resume: {e}"}
-
-def analyze_github_repo(url: str):
-    from langchain_community.document_loaders import WebBaseLoader
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key: return {"error": "GOOGLE_API_KEY not set."}
-    try:
-        loader = WebBaseLoader(url)
-        docs = loader.load()
-        llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", google_api_key=api_key, temperature=0.0)
-        parser = JsonOutputParser(pydantic_object=ProjectDetails)
-        prompt = PromptTemplate(
-            template="""Analyze the GitHub README file. Extract the project title, a 2-bullet point description, and its tech stack.
+def _github_prompt():
+    parser = JsonOutputParser(pydantic_object=ProjectDetails)
+    prompt = PromptTemplate(
+        template="""Analyze the GitHub README file. Extract the project title, a 2-bullet point description, and its tech stack.
 **IMPORTANT**: You MUST return ONLY a JSON object.
 {format_instructions}
 DOCUMENT:
 {document}
 """,
-            input_variables=["document"],
-            partial_variables={"format_instructions": parser.get_format_instructions()}
+        input_variables=["document"],
+        partial_variables={"format_instructions": parser.get_format_instructions()}
+    )
+    return prompt, parser
+
+def _suggest_projects_prompt():
+    parser = JsonOutputParser(pydantic_object=SuggestedProjects)
+    prompt = PromptTemplate(template="Suggest 2 project ideas based on the user's skills. Return ONLY a JSON object.\n{format_instructions}\nUSER'S SKILLS: {skills}", input_variables=["skills"], partial_variables={"format_instructions": parser.get_format_instructions()})
+    return prompt, parser
+
+def _categorize_skills_prompt():
+    parser = JsonOutputParser(pydantic_object=SkillListInternal)
+    prompt = PromptTemplate(template="Categorize these skills into logical groups (e.g., Languages:python,java, Frontend:react, html, css,stremalit, Backend:node.js,express.js,fastapi, AI/ML:langchain,RAG , scikit-learn,tensorflow ,Developer tools like git,github, cs fundamentals like OS,DBMS, CN,machine learning,DL,DSA). Return ONLY JSON.\n{format_instructions}\nSKILLS:\n{skills}", input_variables=["skills"], partial_variables={"format_instructions": parser.get_format_instructions()})
+    return prompt, parser
+
+def _summary_prompt():
+    prompt_text = (
+        "Write a 2-3 sentence professional summary based on these skills and the target job role.\n"
+        "Skills: {skills_text}\n"
+        "Job Role: {job_description}"
+    )
+    return PromptTemplate.from_template(prompt_text), StrOutputParser()
+
+# Task name -> (prompt builder, default temperature, rate-limit priority)
+TASKS = {
+    "parse_resume": (_resume_prompt, 0.0, rate_limit.PRIORITY_BULK),
+    "parse_skills": (_skills_prompt, 0.0, rate_limit.PRIORITY_BULK),
+    "analyze_github": (_github_prompt, 0.0, rate_limit.PRIORITY_DEFAULT),
+    "suggest_projects": (_suggest_projects_prompt, 0.7, rate_limit.PRIORITY_DEFAULT),
+    "categorize_skills": (_categorize_skills_prompt, 0.0, rate_limit.PRIORITY_INTERACTIVE),
+    "generate_summary": (_summary_prompt, 0.0, rate_limit.PRIORITY_INTERACTIVE),
+}
+
+# --- Chain Registry ---
+def _gemini_llm(api_key: str, temperature: float):
+    return ChatGoogleGenerativeAI(model=GEMINI_MODEL, google_api_key=api_key, temperature=temperature)
+
+class CompiledChain(NamedTuple):
+    prompt: PromptTemplate
+    llm: Any
+    parser: Any
+    chain: Any
+    schema: str
+    priority: int
+
+class ChainRegistry:
+    """
+    Builds each (task, temperature) chain once and hands the same objects to every request.
+    LLM clients are shared by all tasks at a given temperature, so their HTTP connections stay
+    pooled across calls. Changing the API key (or calling reload) drops everything built so far.
+    """
+    def __init__(self, tasks, llm_factory=_gemini_llm):
+        self.tasks = tasks
+        self.llm_factory = llm_factory
+        self._api_key = None
+        self._llms = {}
+        self._chains = {}
+        self._lock = threading.Lock()
+
+    def _reset(self, api_key):
+        self._api_key = api_key
+        self._llms = {}
+        self._chains = {}
+
+    def get(self, task: str, api_key: str, temperature: Optional[float] = None) -> CompiledChain:
+        build_prompt, default_temperature, priority = self.tasks[task]
+        temperature = default_temperature if temperature is None else temperature
+        with self._lock:
+            if api_key != self._api_key:
+                self._reset(api_key)
+            compiled = self._chains.get((task, temperature))
+            if compiled is None:
+                llm = self._llms.get(temperature)
+                if llm is None:
+                    llm = self._llms[temperature] = self.llm_factory(api_key, temperature)
+                prompt, parser = build_prompt()
+                compiled = CompiledChain(prompt, llm, parser, prompt | llm | parser, _parser_schema(parser), priority)
+                self._chains[(task, temperature)] = compiled
+            return compiled
+
+    def warm(self, api_key: str):
+        """Builds every registered task up front, e.g. at application startup."""
+        for task in self.tasks:
+            self.get(task, api_key)
+
+    def reload(self, api_key: Optional[str] = None, llm_factory=None):
+        """Drops cached clients and chains, e.g. after the API key has been rotated."""
+        with self._lock:
+            if llm_factory is not None:
+                self.llm_factory = llm_factory
+            self._reset(None)
+        if api_key:
+            self.warm(api_key)
+
+def _default_llm_factory():
+    if AI_BACKEND == "fake":
+        from . import fake_llm
+        return fake_llm.fake_llm
+    return _gemini_llm
+
+chain_registry = ChainRegistry(TASKS, llm_factory=_default_llm_factory())
+
+def reload_chain_registry(api_key: Optional[str] = None):
+    chain_registry.reload(api_key or get_api_key())
+
+# --- Result Post-Processing ---
+def _fetch_document(url: str) -> str:
+    if AI_BACKEND == "fake":
+        # Keep the fake backend fully offline.
+        return f"README for {url}"
+    from langchain_community.document_loaders import WebBaseLoader
+    docs = WebBaseLoader(url).load()
+    return docs[0].page_content if docs else ""
+
+def _extract_pdf_text(pdf_bytes: bytes) -> str:
+    return pdf_text.extract_text(pdf_bytes)
+
+def _skills_from_response(response):
+    if _is_error(response):
+        return None
+    return response.get('skills', [])
+
+def _merge_parsed_resume(parsed_data, parsed_skills):
+    parsed_data['skills'] = parsed_skills
+
+    # Ensure all schema fields correct type and present
+    for field, field_type in ResumeData.__annotations__.items():
+        if field not in parsed_data:
+            if str(field_type).startswith("typing.List"):
+                parsed_data[field] = []
+            else:
+                parsed_data[field] = ""
+        # Fix leetcode field (should never be list)
+        if field == "leetcode" and not isinstance(parsed_data[field], str):
+            parsed_data[field] = ""
+
+    return parsed_data
+
+def _projects_from_response(response):
+    if _is_error(response):
+        return response
+    return response.get('projects', [])
+
+def _categories_from_response(response):
+    if _is_error(response):
+        return [{"category": "Error", "details": response['error']}]
+    return response.get('skills', [])
+
+def _suggest_projects_params(skills):
+    return {"skills": ", ".join([f"{s['category']}: {s['details']}" for s in skills])}
+
+def _summary_params(skills, job_description):
+    return {"skills_text": "; ".join([f"{cat.category}: {cat.details}" for cat in skills]), "job_description": job_description}
+
+# --- Asynchronous API ---
+# Used by the FastAPI endpoints and the parse job workers. LLM calls go through the chains'
+# ainvoke and share _llm_semaphore, so a worker never blocks its event loop on Gemini.
+async def _aparse_skills(resume_text: str, api_key: str, refresh: bool = False) -> Optional[List[Dict[str, str]]]:
+    """The extracted skills, or None when extraction failed."""
+    try:
+        response = await _ainvoke_cached(chain_registry.get("parse_skills", api_key), {"resume_text": resume_text}, refresh=refresh)
+        return _skills_from_response(response)
+    except Exception as e:
+        print(f"Error in _aparse_skills: {e}")
+        return None
+
+async def aparse_resume_from_pdf(pdf_bytes: bytes):
+    try:
+        resume_text = await asyncio.to_thread(_extract_pdf_text, pdf_bytes)
+    except Exception as e:
+        print(f"Error in aparse_resume_from_pdf: {e}")
+        return {"error": f"Failed to parse resume: {e}"}
+    return await aparse_resume_text(resume_text)
+
+async def aparse_resume_text(resume_text: str, refresh: bool = False):
+    parsed, _ = await aparse_resume_text_with_status(resume_text, refresh)
+    return parsed
+
+async def aparse_resume_text_with_status(resume_text: str, refresh: bool = False) -> Tuple[dict, bool]:
+    """Like aparse_resume_text, but also returns whether the result is complete.
+
+    A result is incomplete when skills extraction failed or timed out and the resume came back
+    with skills=[]; it is fine to show but should not be stored for reuse.
+    """
+    api_key = get_api_key()
+    if not api_key: return {"error": "GOOGLE_API_KEY not set."}, False
+    try:
+        main_task = asyncio.create_task(
+            asyncio.wait_for(_ainvoke_cached(chain_registry.get("parse_resume", api_key), {"resume_text": resume_text}, refresh=refresh), PARSE_MAIN_TIMEOUT_SECONDS)
+        )
+        skills_task = asyncio.create_task(
+            asyncio.wait_for(_aparse_skills(resume_text, api_key, refresh), PARSE_SKILLS_TIMEOUT_SECONDS)
         )
-        chain = prompt | llm | parser
-        content = docs[0].page_content if docs else ""
-        return _invoke_with_retry(chain, {"document": content[:10000]})
+        try:
+            parsed_data = await main_task
+        except asyncio.TimeoutError:
+            skills_task.cancel()
+            return {"error": "Timed out while parsing the resume. Please try again."}, False
+
+        if _is_error(parsed_data):
+            skills_task.cancel()
+            return parsed_data, False
+        try:
+            parsed_skills = await skills_task
+        except asyncio.TimeoutError:
+            print("Skills extraction timed out; returning the resume without skills.")
+            parsed_skills = None
+        return _merge_parsed_resume(parsed_data, parsed_skills or []), parsed_skills is not None
+    except Exception as e:
+        print(f"Error in aparse_resume_text: {e}")
+        return {"error": f"Failed to parse resume: {e}"}, False
+
+async def aanalyze_github_repo(url: str):
+    api_key = get_api_key()
+    if not api_key: return {"error": "GOOGLE_API_KEY not set."}
+    try:
+        content = await asyncio.to_thread(_fetch_document, url)
+        return await _ainvoke_cached(chain_registry.get("analyze_github", api_key), {"document": content[:10000]})
     except Exception as e:
         return {"error": f"Failed to analyze repository: {e}"}
 
-def suggest_projects(skills: List[SkillCategory]):
-    api_key = os.getenv("GOOGLE_API_KEY")
+async def asuggest_projects(skills: List[SkillCategory]):
+    api_key = get_api_key()
     if not api_key: return {"error": "GOOGLE_API_KEY not set."}
     try:
-        llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", google_api_key=api_key, temperature=0.7)
-        parser = JsonOutputParser(pydantic_object=SuggestedProjects)
-        skills_text = ", ".join([f"{s['category']}: {s['details']}" for s in skills])
-        prompt = PromptTemplate(template="Suggest 2 project ideas based on the user's skills. Return ONLY a JSON object.\n{format_instructions}\nUSER'S SKILLS: {skills}", input_variables=["skills"], partial_variables={"format_instructions": parser.get_format_instructions()})
-        chain = prompt | llm | parser
-        response = _invoke_with_retry(chain, {"skills": skills_text})
-        if isinstance(response, dict) and "error" in response:
-            return response
-        return response.get('projects', [])
+        response = await _ainvoke_cached(chain_registry.get("suggest_projects", api_key), _suggest_projects_params(skills))
+        return _projects_from_response(response)
     except Exception as e:
         return {"error": f"Failed to get AI suggestions: {e}"}
 
-def categorize_skills(skills_list: List[str]):
-    api_key = os.getenv("GOOGLE_API_KEY")
+async def acategorize_skills(skills_list: List[str]):
+    api_key = get_api_key()
     if not api_key: return [{"category": "Error", "details": "GOOGLE_API_KEY not set."}]
     try:
-        llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", google_api_key=api_key, temperature=0.0)
-        parser = JsonOutputParser(pydantic_object=SkillListInternal)
-        prompt = PromptTemplate(template="Categorize these skills into logical groups (e.g., Languages:python,java, Frontend:react, html, css,stremalit, Backend:node.js,express.js,fastapi, AI/ML:langchain,RAG , scikit-learn,tensorflow ,Developer tools like git,github, cs fundamentals like OS,DBMS, CN,machine learning,DL,DSA). Return ONLY JSON.\n{format_instructions}\nSKILLS:\n{skills}", input_variables=["skills"], partial_variables={"format_instructions": parser.get_format_instructions()})
-        chain = prompt | llm | parser
-        response = _invoke_with_retry(chain, {"skills": ", ".join(skills_list)})
-        if isinstance(response, dict) and "error" in response:
-            return [{"category": "Error", "details": response['error']}]
-        return response.get('skills', [])
+        response = await _ainvoke_cached(chain_registry.get("categorize_skills", api_key), {"skills": ", ".join(skills_list)})
+        return _categories_from_response(response)
     except Exception as e:
         return [{"category": "Skills", "details": ", ".join(skills_list)}]
 
-def generate_summary_from_skills_and_role(skills: List[SkillCategory], job_description: str):
-    api_key = os.getenv("GOOGLE_API_KEY")
+async def agenerate_summary_from_skills_and_role(skills: List[SkillCategory], job_description: str):
+    api_key = get_api_key()
     if not api_key:
         return "Error: GOOGLE_API_KEY not set."
     try:
-        skills_text = "; ".join([f"{cat.category}: {cat.details}" for cat in skills])
-        
-        prompt_text = (
-            "Write a 2-3 sentence professional summary based on these skills and the target job role.\n"
-            "Skills: {skills_text}\n"
-            "Job Role: {job_description}"
-        )
-        
-        prompt = PromptTemplate.from_template(prompt_text)
-        llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.0, google_api_key=api_key)
-        chain = prompt | llm
-        response = _invoke_with_retry(chain, {"skills_text": skills_text, "job_description": job_description})
-        
-        if hasattr(response, 'content'):
-            return response.content
+        response = await _ainvoke_cached(chain_registry.get("generate_summary", api_key), _summary_params(skills, job_description))
         return str(response)
     except Exception as e:
         return f"Error generating summary: {e}"
+
+# --- Streaming API ---
+async def _astream_cached(compiled, params):
+    """
+    Yields the chain's raw stream chunks (text deltas for str parsers, growing partial objects
+    for JSON parsers). A cached response is yielded whole. Errors are yielded as {"error": ...}.
+    Streams are not retried: once output has reached the client a retry would duplicate it.
+    """
+    cache = llm_cache.get_response_cache()
+    key = _cache_key(compiled, params, False)
+    if key is not None:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            yield cached
+            return
+
+    limiter = rate_limit.get_limiter()
+    try:
+        await limiter.aacquire(compiled.priority)
+    except rate_limit.RateLimitExceeded as e:
+        print(f"Rate limiter rejected the call: {e}")
+        yield dict(QUOTA_ERROR)
+        return
+
+    final = None
+    try:
+        async with _llm_semaphore:
+            async for chunk in compiled.chain.astream(params):
+                final = final + chunk if isinstance(chunk, str) and isinstance(final, str) else chunk
+                yield chunk
+    except Exception as e:
+        if rate_limit.is_rate_limit_error(e):
+            limiter.record_throttle(e, 0)
+            yield dict(QUOTA_ERROR)
+        else:
+            print(f"An unexpected error occurred while streaming: {e}")
+            yield {"error": f"An unexpected error occurred: {e}"}
+        return
+    limiter.record_success()
+    if key is not None and final is not None:
+        await asyncio.to_thread(cache.set, key, final)
+
+async def astream_summary(skills: List[SkillCategory], job_description: str):
+    """Yields the summary text piece by piece as the model produces it."""
+    api_key = get_api_key()
+    if not api_key:
+        yield {"error": "GOOGLE_API_KEY not set."}
+        return
+    compiled = chain_registry.get("generate_summary", api_key)
+    async for chunk in _astream_cached(compiled, _summary_params(skills, job_description)):
+        yield chunk
+
+async def astream_project_suggestions(skills: List[SkillCategory]):
+    """Yields each suggested project as soon as the model has finished writing it."""
+    api_key = get_api_key()
+    if not api_key:
+        yield {"error": "GOOGLE_API_KEY not set."}
+        return
+    compiled = chain_registry.get("suggest_projects", api_key)
+    emitted = 0
+    projects = []
+    async for chunk in _astream_cached(compiled, _suggest_projects_params(skills)):
+        if _is_error(chunk):
+            yield chunk
+            return
+        projects = chunk.get('projects', []) if isinstance(chunk, dict) else []
+        # In a partial payload every project except the last one is complete.
+        while emitted < len(projects) - 1:
+            yield projects[emitted]
+            emitted += 1
+    while emitted < len(projects):
+        yield projects[emitted]
+        emitted += 1
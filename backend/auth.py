@@ -1,28 +1,43 @@
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict, deque
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta, timezone
-from . import database, schemas
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import database, schemas, passwords
 
 # --- Configuration ---
 SECRET_KEY = "Shammu@4536@2005@1234567890"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+# Authenticated principals are cached per process for this long; 0 disables the cache.
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+# Failed logins allowed per client IP and per account within LOGIN_WINDOW_SECONDS.
+LOGIN_WINDOW_SECONDS = int(os.getenv("LOGIN_WINDOW_SECONDS", "900"))
+LOGIN_MAX_FAILURES_PER_IP = int(os.getenv("LOGIN_MAX_FAILURES_PER_IP", "30"))
+LOGIN_MAX_FAILURES_PER_ACCOUNT = int(os.getenv("LOGIN_MAX_FAILURES_PER_ACCOUNT", "5"))
+# Comma-separated emails allowed to read the operational stats endpoints.
+ADMIN_EMAILS = {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
 
-# This is our password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # --- Password Utilities ---
+# These hash in the calling thread; the endpoints use the pooled async variants below.
 def verify_password(plain_password, hashed_password):
     """Checks if a plain-text password matches a hashed one."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return passwords.verify_and_update(plain_password, hashed_password)[0]
 
 def get_password_hash(password):
     """Creates a secure hash from a plain-text password."""
-    return pwd_context.hash(password)
+    return passwords.hash_password(password)
 
 # --- User Database & Authentication Functions ---
 def get_user_by_email(db: Session, email: str):
@@ -45,35 +60,250 @@ def authenticate_user(db: Session, email: str, password: str):
         return None
     return user
 
+# --- Async Variants ---
+# Take either session type: an AsyncSession (DB_ASYNC=1) is awaited on the event loop, a sync
+# Session runs in the threadpool. Passwords are hashed in the password pool either way.
+async def _commit(db, *refresh):
+    if isinstance(db, AsyncSession):
+        await db.commit()
+        for obj in refresh:
+            await db.refresh(obj)
+        return
+    def commit():
+        db.commit()
+        for obj in refresh:
+            db.refresh(obj)
+    await run_in_threadpool(commit)
+
+async def aget_user_by_email(db, email: str):
+    """Like get_user_by_email."""
+    if isinstance(db, AsyncSession):
+        return (await db.execute(select(database.User).where(database.User.email == email))).scalars().first()
+    return await run_in_threadpool(get_user_by_email, db, email)
+
+async def acreate_user(db, user: schemas.UserCreate):
+    """Like create_user, with the password hashed in the password pool."""
+    hashed_password = await passwords.ahash_password(user.password)
+    db_user = database.User(email=user.email, hashed_password=hashed_password)
+    db.add(db_user)
+    await _commit(db, db_user)
+    return db_user
+
+async def aauthenticate_user(db, email: str, password: str):
+    """Like authenticate_user, with bcrypt in the password pool. Rehashes passwords stored with an outdated cost."""
+    user = await aget_user_by_email(db, email)
+    if not user:
+        return None
+    matches, new_hash = await passwords.averify_and_update(password, user.hashed_password)
+    if not matches:
+        return None
+    if new_hash:
+        user.hashed_password = new_hash
+        await _commit(db, user)
+    return user
+
+# --- Login Attempt Limiting ---
+class LoginAttemptLimiter:
+    """
+    Counts failed logins per client IP and per account in a sliding window. Checked before any
+    hashing, so brute-force traffic is turned away without spending bcrypt CPU.
+    """
+    # Above this many tracked IPs/accounts, expired entries are swept on the next failure.
+    MAX_TRACKED_KEYS = 100000
+
+    def __init__(self, window_seconds: int, max_per_ip: int, max_per_account: int):
+        self.window_seconds = window_seconds
+        self.limits = {"ip": max_per_ip, "account": max_per_account}
+        self._failures = {}
+        self._lock = threading.Lock()
+
+    def _recent(self, key, now):
+        failures = self._failures.get(key)
+        if failures is None:
+            return None
+        while failures and failures[0] <= now - self.window_seconds:
+            failures.popleft()
+        if not failures:
+            del self._failures[key]
+            return None
+        return failures
+
+    def retry_after(self, ip: str, account: str) -> float:
+        """Seconds until another attempt is allowed for this IP and account; 0 if allowed now."""
+        now = time.monotonic()
+        wait = 0.0
+        with self._lock:
+            for key in (("ip", ip), ("account", account.lower())):
+                failures = self._recent(key, now)
+                if failures and len(failures) >= self.limits[key[0]]:
+                    wait = max(wait, failures[0] + self.window_seconds - now)
+        return wait
+
+    def record_failure(self, ip: str, account: str):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._failures) >= self.MAX_TRACKED_KEYS:
+                for key in list(self._failures):
+                    self._recent(key, now)
+            for key in (("ip", ip), ("account", account.lower())):
+                self._failures.setdefault(key, deque()).append(now)
+
+    def record_success(self, account: str):
+        with self._lock:
+            self._failures.pop(("account", account.lower()), None)
+
+login_limiter = LoginAttemptLimiter(LOGIN_WINDOW_SECONDS, LOGIN_MAX_FAILURES_PER_IP, LOGIN_MAX_FAILURES_PER_ACCOUNT)
+
 # --- JWT Token Functions ---
 def create_access_token(data: dict):
     """Creates a new JWT access token."""
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+# --- Principal Cache ---
+# Maps (token subject, token id) to the authenticated user, so protected requests skip the user
+# lookup. Entries are dropped when the user row changes or is deleted in this process; other
+# processes pick up such changes within AUTH_CACHE_TTL_SECONDS.
+_principals = OrderedDict()
+_principals_lock = threading.Lock()
+
+def _cached_principal(key):
+    if AUTH_CACHE_TTL_SECONDS <= 0:
+        return None
+    with _principals_lock:
+        entry = _principals.get(key)
+        if entry is None:
+            return None
+        principal, expires_at = entry
+        if time.monotonic() > expires_at:
+            del _principals[key]
+            return None
+        _principals.move_to_end(key)
+        return principal
+
+def _remember_principal(key, user) -> schemas.User:
+    principal = schemas.User(id=user.id, email=user.email)
+    if AUTH_CACHE_TTL_SECONDS > 0:
+        with _principals_lock:
+            _principals[key] = (principal, time.monotonic() + AUTH_CACHE_TTL_SECONDS)
+            while len(_principals) > AUTH_CACHE_MAX_ENTRIES:
+                _principals.popitem(last=False)
+    return principal
+
+def invalidate_user(user_id: int):
+    """Drops every cached principal for the user."""
+    with _principals_lock:
+        for key in [key for key, (principal, _) in _principals.items() if principal.id == user_id]:
+            del _principals[key]
+
+@event.listens_for(database.User, "after_update")
+@event.listens_for(database.User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    invalidate_user(target.id)
+
 # --- Dependency to Get the Current Logged-In User ---
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
-    """
-    A dependency that can be used on any endpoint to get the current user.
-    It verifies the JWT and fetches the user from the database.
-    """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+def _decode_token(token: str) -> dict:
+    """Verifies the JWT (signature and expiry) and returns its claims."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = get_user_by_email(db, email=email)
+    if payload.get("sub") is None:
+        raise credentials_exception
+    return payload
+
+def _principal_key(payload: dict):
+    # Tokens issued before ids were added carry no jti; they share one entry per subject.
+    return payload["sub"], payload.get("jti")
+
+def _user_filter(payload: dict):
+    """Looks users up by primary key when the token carries their id, else by email (older tokens)."""
+    if payload.get("uid") is not None:
+        return (database.User.id == payload["uid"]) & (database.User.email == payload["sub"])
+    return database.User.email == payload["sub"]
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
+    """
+    A dependency that can be used on any endpoint to get the current user.
+    It verifies the JWT and resolves the user from the principal cache, or the database on a miss.
+    """
+    payload = _decode_token(token)
+    key = _principal_key(payload)
+    principal = _cached_principal(key)
+    if principal is not None:
+        return principal
+    user = db.query(database.User).filter(_user_filter(payload)).first()
     if user is None:
         raise credentials_exception
-    return user
+    return _remember_principal(key, user)
+
+def get_current_admin(current_user: schemas.User = Depends(get_current_user)):
+    """Like get_current_user, but rejects accounts not listed in ADMIN_EMAILS."""
+    if current_user.email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Restricted to administrators.")
+    return current_user
 
+def get_current_user_and_resume(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
+    """Like get_current_user, but also loads the user's resume: one query whether or not the user is cached."""
+    return _load_user_and_resume(token, db)
+
+def get_current_user_and_resume_for_read(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_read_db)):
+    """
+    get_current_user_and_resume against the read replica, for endpoints that don't write. The
+    document columns are deferred: call database.load_document once the ETag check has failed.
+    """
+    return _load_user_and_resume(token, db, database.DEFER_DOCUMENT)
+
+def _load_user_and_resume(token: str, db: Session, options=()):
+    payload = _decode_token(token)
+    key = _principal_key(payload)
+    principal = _cached_principal(key)
+    if principal is not None:
+        return principal, db.query(database.Resume).options(*options).filter(database.Resume.owner_id == principal.id).first()
+    row = (
+        db.query(database.User, database.Resume)
+        .outerjoin(database.Resume, database.Resume.owner_id == database.User.id)
+        .options(*options)
+        .filter(_user_filter(payload))
+        .first()
+    )
+    if row is None:
+        raise credentials_exception
+    user, db_resume = row
+    return _remember_principal(key, user), db_resume
+
+async def aget_current_user_and_resume(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(database.get_async_db)):
+    """get_current_user_and_resume on the async engine (DB_ASYNC=1)."""
+    return await _aload_user_and_resume(token, db)
+
+async def aget_current_user_and_resume_for_read(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(database.get_async_read_db)):
+    """get_current_user_and_resume_for_read on the async engine (DB_ASYNC=1); see database.aload_document."""
+    return await _aload_user_and_resume(token, db, database.DEFER_DOCUMENT)
+
+async def _aload_user_and_resume(token: str, db: AsyncSession, options=()):
+    payload = _decode_token(token)
+    key = _principal_key(payload)
+    principal = _cached_principal(key)
+    if principal is not None:
+        result = await db.execute(select(database.Resume).options(*options).where(database.Resume.owner_id == principal.id))
+        return principal, result.scalars().first()
+    result = await db.execute(
+        select(database.User, database.Resume)
+        .outerjoin(database.Resume, database.Resume.owner_id == database.User.id)
+        .options(*options)
+        .where(_user_filter(payload))
+    )
+    row = result.first()
+    if row is None:
+        raise credentials_exception
+    user, db_resume = row
+    return _remember_principal(key, user), db_resume
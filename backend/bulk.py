@@ -0,0 +1,214 @@
+"""
+Bulk import and export of users and their resumes as NDJSON, one record per line:
+
+    {"email": "a@example.com", "password": "...", "resume": {...ResumeData...}}
+
+Import reads BULK_IMPORT_CHUNK_SIZE lines at a time and validates each against
+schemas.BulkUserRecord. The chunk's passwords are hashed in parallel on a process pool. Its users
+and resumes are then inserted with one executemany each, in a single transaction. Invalid lines,
+repeated emails and already registered emails are reported by line number and skipped. The rest
+of the chunk is still imported.
+
+Export walks users in id order one chunk at a time, so memory stays flat however many users
+there are. Password hashes are included only on request; with them the export can be imported
+again as-is.
+
+    python -m backend.bulk import cohort.ndjson --workers 8
+    python -m backend.bulk export -o users.ndjson --with-password-hashes
+
+bcrypt dominates import time: a hash at the default cost (BCRYPT_ROUNDS=12) takes about a quarter
+second per core. --bcrypt-rounds lowers the cost for the import only. Those hashes are upgraded to
+BCRYPT_ROUNDS on each user's first login (see auth.aauthenticate_user).
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from . import database, schemas, passwords, process_pools
+
+# --- Configuration ---
+BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", "1000"))
+BULK_IMPORT_WORKERS = int(os.getenv("BULK_IMPORT_WORKERS", str(os.cpu_count() or 2)))
+BULK_EXPORT_CHUNK_SIZE = 1000
+# Individual errors kept in the report; the counts are always complete.
+MAX_REPORTED_ERRORS = 1000
+
+users = database.User.__table__
+resumes = database.Resume.__table__
+
+# Lines are (line number, record or None, error or None).
+Line = Tuple[int, Optional[schemas.BulkUserRecord], Optional[str]]
+
+class ImportReport:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.received = 0
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def fail(self, line: int, error: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+    def summary(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "received": self.received,
+            "created": self.created,
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 3),
+            "records_per_second": round(self.received / elapsed, 1) if elapsed else None,
+            "errors": self.errors,
+        }
+
+# --- Import ---
+def _validation_message(e: ValidationError) -> str:
+    error = e.errors()[0]
+    location = ".".join(str(part) for part in error["loc"])
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+def iter_records(lines: Iterable) -> Iterator[Line]:
+    """Parses and validates NDJSON lines (str or bytes); blank lines are skipped."""
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = schemas.BulkUserRecord.model_validate_json(line)
+        except ValidationError as e:
+            yield number, None, _validation_message(e)
+            continue
+        if not record.password and not record.hashed_password:
+            yield number, None, "Provide password or hashed_password."
+        elif record.hashed_password and not record.hashed_password.startswith("$2"):
+            yield number, None, "hashed_password must be a bcrypt hash."
+        else:
+            yield number, record, None
+
+def import_chunk(chunk: List[Line], executor: Executor, rounds: Optional[int], report: ImportReport):
+    valid, seen = [], set()
+    for number, record, error in chunk:
+        report.received += 1
+        if error:
+            report.fail(number, error)
+        elif record.email in seen:
+            report.fail(number, "Email appears earlier in this import.")
+        else:
+            seen.add(record.email)
+            valid.append((number, record))
+    if not valid:
+        return
+
+    with database.engine.connect() as conn:
+        registered = set(conn.execute(select(users.c.email).where(users.c.email.in_(seen))).scalars())
+    for number, record in valid:
+        if record.email in registered:
+            report.fail(number, "Email already registered.")
+    valid = [(number, record) for number, record in valid if record.email not in registered]
+    if not valid:
+        return
+
+    plain = [record.password for _, record in valid if not record.hashed_password]
+    hashes = executor.map(passwords.hash_password, plain, itertools.repeat(rounds), chunksize=16)
+    user_rows = [{"email": record.email, "hashed_password": record.hashed_password or next(hashes)} for _, record in valid]
+    try:
+        with database.engine.begin() as conn:
+            ids = dict(conn.execute(users.insert().returning(users.c.email, users.c.id), user_rows).all())
+            resume_rows = []
+            for _, record in valid:
+                if record.resume is None:
+                    continue
+                resume_json, resume_blob = database.store_resume(record.resume.dict())
+                resume_rows.append({"owner_id": ids[record.email], "resume_data": resume_json, "resume_blob": resume_blob, "version": 1})
+            if resume_rows:
+                conn.execute(resumes.insert(), resume_rows)
+    except IntegrityError:
+        # Another writer registered one of these emails since the check above.
+        for number, _ in valid:
+            report.fail(number, "Chunk rolled back: an email was registered concurrently. Re-import this line.")
+        return
+    report.created += len(valid)
+
+def import_lines(lines: Iterable, executor: Executor, rounds: Optional[int] = None, chunk_size: int = BULK_IMPORT_CHUNK_SIZE) -> dict:
+    if rounds is not None and not 4 <= rounds <= passwords.BCRYPT_ROUNDS:
+        raise ValueError(f"bcrypt rounds must be between 4 and {passwords.BCRYPT_ROUNDS}.")
+    report = ImportReport()
+    records = iter_records(lines)
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            break
+        import_chunk(chunk, executor, rounds, report)
+    return report.summary()
+
+def get_executor() -> ProcessPoolExecutor:
+    """The import hashing pool, kept separate from the login hashing pool so imports can't starve logins."""
+    return process_pools.get_pool("bulk_import", BULK_IMPORT_WORKERS)
+
+def import_file(f: BinaryIO, rounds: Optional[int] = None, executor: Optional[Executor] = None) -> dict:
+    return import_lines(f, executor or get_executor(), rounds)
+
+# --- Export ---
+def iter_export(include_password_hashes: bool = False, chunk_size: int = BULK_EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yields NDJSON for every user and resume, one chunk of users per query."""
+    query = (
+        select(users.c.id, users.c.email, users.c.hashed_password, resumes.c.resume_data, resumes.c.resume_blob)
+        .select_from(users.outerjoin(resumes, resumes.c.owner_id == users.c.id))
+        .order_by(users.c.id)
+        .limit(chunk_size)
+    )
+    last_id = 0
+    while True:
+        # The connection is released before the chunk is yielded, so a slow reader doesn't hold it.
+        with database.engine.connect() as conn:
+            rows = conn.execute(query.where(users.c.id > last_id)).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        lines = []
+        for row in rows:
+            record = {"email": row.email}
+            if include_password_hashes:
+                record["hashed_password"] = row.hashed_password
+            data = database.load_resume(row.resume_data, row.resume_blob)
+            if data:
+                record["resume"] = data
+            lines.append(json.dumps(record, separators=(",", ":")))
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+# --- CLI ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import or export users and resumes as NDJSON.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="create users and resumes from an NDJSON file ('-' for stdin)")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--workers", type=int, default=BULK_IMPORT_WORKERS, help="password hashing processes")
+    import_parser.add_argument("--bcrypt-rounds", type=int, help=f"bcrypt cost for this import (default {passwords.BCRYPT_ROUNDS})")
+    export_parser = commands.add_parser("export", help="write every user and resume as NDJSON")
+    export_parser.add_argument("-o", "--output", default="-", help="output file ('-' for stdout)")
+    export_parser.add_argument("--with-password-hashes", action="store_true", help="include bcrypt hashes so the file can be re-imported")
+    args = parser.parse_args()
+
+    database.init_db()
+    if args.command == "import":
+        source = sys.stdin.buffer if args.file == "-" else open(args.file, "rb")
+        with source, ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            summary = import_file(source, args.bcrypt_rounds, executor)
+        for error in summary["errors"]:
+            print(f"line {error['line']}: {error['error']}")
+        print(f"Created {summary['created']} of {summary['received']} records ({summary['failed']} failed) in "
+              f"{summary['elapsed_seconds']}s - {summary['records_per_second']} records/s")
+    else:
+        out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+        with out:
+            for chunk in iter_export(args.with_password_hashes):
+                out.write(chunk)
@@ -1,21 +1,182 @@
 import os
-from sqlalchemy import create_engine, Column, Integer, String, JSON, ForeignKey
-from sqlalchemy.orm import sessionmaker, relationship
+import gzip
+import json
+import time
+from sqlalchemy import create_engine, event, inspect, text, Column, Integer, String, JSON, ForeignKey, DateTime, LargeBinary, Text, Index
+from sqlalchemy.orm import sessionmaker, relationship, defer
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from sqlalchemy.ext.declarative import declarative_base
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 # Use DATABASE_URL environment variable for PostgreSQL, default to SQLite for local dev
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./resume_app.db")
+# Optional read replica; GET /resume/ reads from it when set.
+SQLALCHEMY_READ_DATABASE_URL = os.getenv("DATABASE_READ_URL", "")
+
+# --- Engine Configuration ---
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Recycling connections before the server or a proxy drops them replaces pre-ping's extra
+# round-trip per checkout; turn pre-ping back on for networks that drop idle connections early.
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "0") == "1"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+# Serve signup, login and GET/PUT/PATCH /resume/ through an async engine (asyncpg or aiosqlite).
+DB_ASYNC = os.getenv("DB_ASYNC", "0") == "1"
+# Create missing tables at app startup. Set to 0 in production and run `python -m backend.database` once per deploy.
+DB_AUTO_CREATE = os.getenv("DB_AUTO_CREATE", "1") != "0"
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that counts checkouts that had to wait for a free connection, and for how long."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = {"connects": 0, "checkouts": 0, "checkins": 0, "waits": 0, "wait_seconds_total": 0.0, "wait_seconds_max": 0.0}
+
+    def _do_get(self):
+        if self.checkedin() == 0 and -1 < self._max_overflow <= self.overflow():
+            started = time.perf_counter()
+            conn = super()._do_get()
+            waited = time.perf_counter() - started
+            self.metrics["waits"] += 1
+            self.metrics["wait_seconds_total"] += waited
+            self.metrics["wait_seconds_max"] = max(self.metrics["wait_seconds_max"], waited)
+            return conn
+        return super()._do_get()
+
+    def recreate(self):
+        # Called on dispose(); keep counting into the same metrics.
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+class MeteredAsyncQueuePool(MeteredQueuePool, AsyncAdaptedQueuePool):
+    """MeteredQueuePool for async engines."""
 
-# For PostgreSQL, remove check_same_thread and add pool_pre_ping
-# For SQLite, keep check_same_thread
-connect_args = {}
-if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
-    connect_args["check_same_thread"] = False
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers proceed while a write is in progress; NORMAL is durable across app crashes in WAL mode.
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args=connect_args, pool_pre_ping=True
-)
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+def async_url(url: str) -> str:
+    """Swaps the URL's driver for its async counterpart, e.g. postgresql+psycopg2:// -> postgresql+asyncpg://."""
+    scheme, rest = url.split("://", 1)
+    return f"{ASYNC_DRIVERS.get(scheme.split('+')[0], scheme)}://{rest}"
+
+def build_engine(url: str, asynchronous: bool = False):
+    """Creates the engine for `url`; with asynchronous=True an AsyncEngine on the URL's async driver."""
+    kwargs = {"pool_pre_ping": DB_POOL_PRE_PING}
+    if asynchronous:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        url, create, poolclass = async_url(url), create_async_engine, MeteredAsyncQueuePool
+    else:
+        create, poolclass = create_engine, MeteredQueuePool
+    if url.startswith("sqlite") and not asynchronous:
+        # For SQLite, keep check_same_thread
+        kwargs["connect_args"] = {"check_same_thread": False}
+    if url.startswith("sqlite") and (":memory:" in url or url.split("://")[1].strip("/") == ""):
+        return create(url, **kwargs)
+    kwargs.update(
+        poolclass=poolclass,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+    new_engine = create(url, **kwargs)
+    # Events are registered on the sync core of an AsyncEngine.
+    core = new_engine.sync_engine if asynchronous else new_engine
+    if url.startswith("sqlite"):
+        event.listen(core, "connect", _set_sqlite_pragmas)
+    for event_name, counter in (("connect", "connects"), ("checkout", "checkouts"), ("checkin", "checkins")):
+        event.listen(core, event_name, _counter(core, counter))
+    return new_engine
+
+def _counter(target_engine, counter):
+    def count(*args):
+        target_engine.pool.metrics[counter] += 1
+    return count
+
+engine = build_engine(SQLALCHEMY_DATABASE_URL)
+read_engine = build_engine(SQLALCHEMY_READ_DATABASE_URL) if SQLALCHEMY_READ_DATABASE_URL else engine
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Only built when DB_ASYNC=1, so the sync path doesn't need the async drivers installed.
+async_engine = async_read_engine = AsyncSessionLocal = AsyncReadSessionLocal = None
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    async_engine = build_engine(SQLALCHEMY_DATABASE_URL, asynchronous=True)
+    async_read_engine = build_engine(SQLALCHEMY_READ_DATABASE_URL, asynchronous=True) if SQLALCHEMY_READ_DATABASE_URL else async_engine
+    # expire_on_commit=False: attributes stay readable after commit without an implicit (blocking) reload.
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
+def pool_stats() -> dict:
+    """Checkout/wait counters and current occupancy for each engine's pool."""
+    engines = {"primary": engine}
+    if read_engine is not engine:
+        engines["replica"] = read_engine
+    if async_engine is not None:
+        engines["async_primary"] = async_engine.sync_engine
+        if async_read_engine is not async_engine:
+            engines["async_replica"] = async_read_engine.sync_engine
+    stats = {}
+    for name, target in engines.items():
+        pool = target.pool
+        stats[name] = {
+            **getattr(pool, "metrics", {}),
+            "size": pool.size() if hasattr(pool, "size") else None,
+            "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+            "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+        }
+    return stats
+
+# --- Resume Storage ---
+# "json" stores resume documents in the resume_data column (JSONB on PostgreSQL); "gzip" and "zstd"
+# store compressed JSON in resume_blob instead. Rows in either form are read transparently, so the
+# format can change at any time; `python -m backend.resume_storage --migrate` converts existing rows.
+RESUME_STORAGE_FORMAT = os.getenv("RESUME_STORAGE_FORMAT", "json")
+if RESUME_STORAGE_FORMAT == "zstd" and zstandard is None:
+    print("RESUME_STORAGE_FORMAT=zstd needs the 'zstandard' package; storing resumes as gzip instead.")
+    RESUME_STORAGE_FORMAT = "gzip"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+def encode_resume(data: dict, storage_format: str = None) -> bytes:
+    """Compresses a resume document for resume_blob."""
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    if (storage_format or RESUME_STORAGE_FORMAT) == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(raw)
+    return gzip.compress(raw, compresslevel=6, mtime=0)
+
+def decode_resume(blob: bytes) -> dict:
+    """Inverse of encode_resume; the codec is recognised from the blob's magic bytes."""
+    if blob[:4] == ZSTD_MAGIC:
+        return json.loads(zstandard.ZstdDecompressor().decompress(blob))
+    return json.loads(gzip.decompress(blob))
+
+def store_resume(data):
+    """(resume_json, resume_blob) column values for a document in the current RESUME_STORAGE_FORMAT."""
+    if RESUME_STORAGE_FORMAT == "json" or data is None:
+        return data, None
+    return None, encode_resume(data)
+
+def load_resume(resume_json, resume_blob):
+    """The stored document from a row's two storage columns."""
+    if resume_blob is not None:
+        return decode_resume(resume_blob)
+    # Some older rows hold the document as a JSON string.
+    return json.loads(resume_json) if isinstance(resume_json, str) else resume_json
 
 Base = declarative_base()
 
@@ -31,9 +192,101 @@ class User(Base):
 class Resume(Base):
     __tablename__ = "resumes"
     id = Column(Integer, primary_key=True, index=True)
-    resume_data = Column(JSON)
-    owner_id = Column(Integer, ForeignKey("users.id"))
+    # The document lives in exactly one of these, depending on RESUME_STORAGE_FORMAT when it was written.
+    # Read and write it through resume_data.
+    resume_json = Column("resume_data", JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"))
+    resume_blob = Column(LargeBinary)
+    owner_id = Column(Integer, ForeignKey("users.id"), unique=True, index=True)
+    # Incremented by SQLAlchemy on every write; an UPDATE against a stale version raises StaleDataError.
+    version = Column(Integer, nullable=False, server_default="0")
     owner = relationship("User", back_populates="resume")
+    __mapper_args__ = {"version_id_col": version}
+
+    @property
+    def resume_data(self):
+        blob = self.resume_blob
+        decoded = self.__dict__.get("_decoded")
+        if decoded is not None and decoded[0] is blob:
+            return decoded[1]
+        data = load_resume(self.resume_json, blob)
+        if blob is not None:
+            self.__dict__["_decoded"] = (blob, data)
+        return data
+
+    @resume_data.setter
+    def resume_data(self, value):
+        self.resume_json, self.resume_blob = store_resume(value)
+
+# Query options for reads that may end at the version check (a 304): the document columns are
+# left unloaded until load_document, so an unchanged resume never reads its JSON or blob.
+DEFER_DOCUMENT = (defer(Resume.resume_json), defer(Resume.resume_blob))
+_DOCUMENT_COLUMNS = ["resume_json", "resume_blob"]
+
+def load_document(db, db_resume):
+    """Loads both deferred document columns of a resume in one query."""
+    db.refresh(db_resume, _DOCUMENT_COLUMNS)
+
+async def aload_document(db, db_resume):
+    await db.refresh(db_resume, _DOCUMENT_COLUMNS)
+
+class ParseJob(Base):
+    __tablename__ = "parse_jobs"
+    id = Column(String, primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True)
+    status = Column(String, index=True)
+    pdf_data = Column(LargeBinary)
+    result = Column(JSON)
+    error = Column(Text)
+    created_at = Column(DateTime, index=True)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+class ParsedUpload(Base):
+    __tablename__ = "parsed_uploads"
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"))
+    pdf_hash = Column(String)
+    text_hash = Column(String, index=True)
+    result = Column(JSON)
+    created_at = Column(DateTime)
+    last_used_at = Column(DateTime, index=True)
+    __table_args__ = (Index("ix_parsed_uploads_owner_pdf", "owner_id", "pdf_hash"),)
+
+class ResumeVersion(Base):
+    __tablename__ = "resume_versions"
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"))
+    version = Column(Integer, nullable=False)
+    kind = Column(String, nullable=False)  # "snapshot" (full resume) or "delta" (changes from version - 1)
+    data = Column(LargeBinary, nullable=False)  # zlib-compressed JSON
+    created_at = Column(DateTime)
+    __table_args__ = (Index("ix_resume_versions_owner_version", "owner_id", "version", unique=True),)
+
+# --- Schema Upgrades ---
+# create_all only creates missing tables, so columns added to existing tables are listed here.
+# Indexes that existing data may violate (e.g. the unique resumes.owner_id) are added by
+# `python -m backend.resume_storage --migrate` instead.
+BINARY_DDL = "BYTEA" if engine.dialect.name == "postgresql" else "BLOB"
+ADDED_COLUMNS = {
+    "resumes": [("version", "INTEGER NOT NULL DEFAULT 0"), ("resume_blob", BINARY_DDL)],
+}
+
+def add_missing_columns():
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    with engine.begin() as conn:
+        for table, columns in ADDED_COLUMNS.items():
+            if table not in tables:
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table)}
+            for name, ddl in columns:
+                if name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+def init_db():
+    """Creates missing tables and columns."""
+    Base.metadata.create_all(bind=engine)
+    add_missing_columns()
 
 # --- Dependency for Database Sessions ---
 def get_db():
@@ -41,4 +294,35 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_read_db():
+    """Session on the read replica (or the primary when none is configured), for read-only endpoints."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    """AsyncSession dependency (DB_ASYNC=1)."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    """get_read_db for the async engine."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+# Session for endpoints that serve both paths: an AsyncSession when DB_ASYNC=1, else a Session.
+get_session = get_async_db if DB_ASYNC else get_db
+
+async def dispose_async_engines():
+    if async_engine is not None:
+        await async_engine.dispose()
+        if async_read_engine is not async_engine:
+            await async_read_engine.dispose()
+
+if __name__ == "__main__":
+    init_db()
+    print(f"Database schema is up to date at {engine.url.render_as_string(hide_password=True)}")
\ No newline at end of file
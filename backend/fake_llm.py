@@ -0,0 +1,148 @@
+"""
+Deterministic stand-in for Gemini, selected with AI_BACKEND=fake.
+
+It answers every ai_utils task with a schema-valid payload (ResumeData, SkillListInternal,
+SuggestedProjects, ProjectDetails or plain summary text) derived from a hash of the prompt, so
+repeated prompts get identical answers. Latency, generic failures and 429s can be injected to
+exercise the retry, rate-limit and timeout paths without spending any quota:
+
+    FAKE_LLM_LATENCY_MS         mean response latency (default 0)
+    FAKE_LLM_LATENCY_JITTER_MS  +/- uniform jitter around the mean (default 0)
+    FAKE_LLM_ERROR_RATE         probability of a generic failure (default 0)
+    FAKE_LLM_RATE_LIMIT_RATE    probability of a 429 (default 0)
+    FAKE_LLM_SEED               seed for the latency/failure draws (default 0)
+"""
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+from typing import Any, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+# --- Configuration ---
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "0"))
+FAKE_LLM_LATENCY_JITTER_MS = float(os.getenv("FAKE_LLM_LATENCY_JITTER_MS", "0"))
+FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", "0"))
+FAKE_LLM_RATE_LIMIT_RATE = float(os.getenv("FAKE_LLM_RATE_LIMIT_RATE", "0"))
+FAKE_LLM_SEED = int(os.getenv("FAKE_LLM_SEED", "0"))
+
+_rng = random.Random(FAKE_LLM_SEED)
+
+class FakeRateLimitError(Exception):
+    """Mimics Gemini's quota error, including its status code and retry hint."""
+    code = 429
+
+class FakeLLMError(Exception):
+    pass
+
+# --- Canned Payloads ---
+def _resume_payload(tag: str) -> dict:
+    return {
+        "name": f"Candidate {tag}",
+        "email": f"candidate{tag}@example.com",
+        "phone": "+1 555 0100",
+        "linkedin": f"https://linkedin.com/in/candidate{tag}",
+        "github": f"https://github.com/candidate{tag}",
+        "leetcode": "",
+        "summary": "Software engineer focused on backend systems and applied machine learning.",
+        "education": [{"degree": "B.E. Computer Science", "institution": "Example Institute of Technology", "dates": "2021 - 2025", "grade_type": "CGPA", "grade_value": "8.9"}],
+        "projects": [
+            {"title": f"Project {tag}: Resume Builder", "points": ["Built a FastAPI backend with JWT auth.", "Generated PDFs with ReportLab."], "techStack": "Python, FastAPI, ReportLab", "repo_link": ""},
+            {"title": "Job Tracker", "points": ["Tracked applications with a Streamlit UI.", "Stored data in PostgreSQL."], "techStack": "Python, Streamlit, PostgreSQL", "repo_link": ""},
+        ],
+        "internships": [{"role": "Software Intern", "company": "Example Corp", "dates": "May 2024 - Jul 2024", "responsibilities": ["Wrote REST endpoints.", "Added integration tests."]}],
+        "experience": [],
+        "skills": [],
+        "achievements": ["Top 5% in a national coding contest."],
+        "leadership": ["Lead, university coding club."],
+        "section_order": [],
+    }
+
+def _skills_payload() -> dict:
+    return {"skills": [
+        {"category": "Languages", "details": "Python, Java, SQL"},
+        {"category": "Frameworks/Tools", "details": "FastAPI, Streamlit, Git"},
+        {"category": "AI/ML", "details": "LangChain, scikit-learn"},
+    ]}
+
+def _project_payload(tag: str, index: int = 0) -> dict:
+    return {
+        "title": f"Idea {tag}-{index}: Smart Study Planner",
+        "description": ["Schedules study sessions from course deadlines.", "Suggests resources with an LLM."],
+        "tech_stack": "Python, FastAPI, React",
+    }
+
+def _summary_payload(tag: str) -> str:
+    return (f"Results-driven engineer ({tag}) with hands-on experience building APIs and data-driven applications. "
+            "Comfortable across the stack and eager to ship reliable, well-tested software.")
+
+def respond_to(prompt: str) -> str:
+    """Picks the payload shape from the schema embedded in the prompt's format instructions."""
+    tag = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:6]
+    if '"section_order"' in prompt:
+        return json.dumps(_resume_payload(tag))
+    if '"projects"' in prompt and '"tech_stack"' in prompt:
+        return json.dumps({"projects": [_project_payload(tag, 0), _project_payload(tag, 1)]})
+    if '"tech_stack"' in prompt:
+        return json.dumps(_project_payload(tag))
+    if '"skills"' in prompt and '"category"' in prompt:
+        return json.dumps(_skills_payload())
+    return _summary_payload(tag)
+
+# --- Chat Model ---
+class FakeChatModel(BaseChatModel):
+    model: str = "fake-llm"
+    temperature: float = 0.0
+    latency_ms: float = FAKE_LLM_LATENCY_MS
+    latency_jitter_ms: float = FAKE_LLM_LATENCY_JITTER_MS
+    error_rate: float = FAKE_LLM_ERROR_RATE
+    rate_limit_rate: float = FAKE_LLM_RATE_LIMIT_RATE
+    stream_chunk_chars: int = 24
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-resume-llm"
+
+    def _delay_seconds(self) -> float:
+        jitter = _rng.uniform(-self.latency_jitter_ms, self.latency_jitter_ms) if self.latency_jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def _maybe_fail(self):
+        roll = _rng.random()
+        if roll < self.rate_limit_rate:
+            raise FakeRateLimitError("429 Resource has been exhausted (e.g. check quota). Please retry in 1s.")
+        if roll < self.rate_limit_rate + self.error_rate:
+            raise FakeLLMError("Injected fake LLM failure.")
+
+    def _chunks(self, text: str):
+        for start in range(0, len(text), self.stream_chunk_chars):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=text[start:start + self.stream_chunk_chars]))
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self._delay_seconds())
+        self._maybe_fail()
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=respond_to(messages[-1].content)))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self._delay_seconds())
+        self._maybe_fail()
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=respond_to(messages[-1].content)))])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any):
+        time.sleep(self._delay_seconds())
+        self._maybe_fail()
+        yield from self._chunks(respond_to(messages[-1].content))
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any):
+        await asyncio.sleep(self._delay_seconds())
+        self._maybe_fail()
+        for chunk in self._chunks(respond_to(messages[-1].content)):
+            yield chunk
+
+def fake_llm(api_key: str, temperature: float) -> FakeChatModel:
+    """ChainRegistry llm_factory for the fake backend."""
+    return FakeChatModel(temperature=temperature)
@@ -0,0 +1,253 @@
+"""
+Background job queue for resume parsing.
+
+The parse_jobs table doubles as the broker: the API enqueues rows, and workers claim them with
+an atomic status update. That means the same code runs against a local SQLite file (no broker
+to install) and against PostgreSQL in production, and workers can live either inside the API
+process (asyncio tasks started at app startup) or in a separate process:
+
+    python -m backend.jobs --workers 4
+"""
+import os
+import uuid
+import asyncio
+import argparse
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import DateTime, LargeBinary, func, literal, select
+from sqlalchemy.orm import Session
+from . import database, upload_dedup
+
+# --- Configuration ---
+JOB_QUEUE_MAX_DEPTH = int(os.getenv("JOB_QUEUE_MAX_DEPTH", "500"))
+JOB_QUEUE_MAX_PER_USER = int(os.getenv("JOB_QUEUE_MAX_PER_USER", "3"))
+# In-process asyncio workers per API worker; set to 0 when parsing runs in a separate process.
+JOB_WORKERS = int(os.getenv("PARSE_JOB_WORKERS", "2"))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("PARSE_JOB_POLL_INTERVAL_SECONDS", "0.5"))
+# Jobs left "running" this long (e.g. after a worker crash) are put back on the queue.
+JOB_STALE_AFTER_SECONDS = int(os.getenv("PARSE_JOB_STALE_AFTER_SECONDS", "300"))
+# Finished jobs (done or failed) are deleted this long after they finish.
+JOB_RETENTION_SECONDS = int(os.getenv("PARSE_JOB_RETENTION_SECONDS", "86400"))
+# How often the stale-job and retention checks run alongside the workers.
+JOB_MAINTENANCE_INTERVAL_SECONDS = float(os.getenv("PARSE_JOB_MAINTENANCE_INTERVAL_SECONDS", "60"))
+# How many of the oldest queued jobs a worker considers when picking the fairest one.
+JOB_FAIRNESS_WINDOW = 100
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+class QueueFullError(Exception):
+    """Raised when the global queue depth limit is reached."""
+
+class UserQueueLimitError(Exception):
+    """Raised when a user already has the maximum number of jobs in flight."""
+
+def _now():
+    return datetime.now(timezone.utc)
+
+parse_jobs = database.ParseJob.__table__
+
+# --- Queue Operations ---
+def _queued_count():
+    return select(func.count()).select_from(parse_jobs).where(parse_jobs.c.status == QUEUED).scalar_subquery()
+
+def enqueue_parse_job(db: Session, owner_id: int, pdf_bytes: bytes) -> database.ParseJob:
+    """
+    Adds a parse job for the user, enforcing the global and per-user depth limits.
+    The limits are checked by the INSERT itself, so two concurrent uploads can't both pass a
+    count taken before either was inserted. On PostgreSQL the user's row is locked first, which
+    serializes one user's enqueues; SQLite serializes all writes anyway.
+    """
+    db.query(database.User.id).filter(database.User.id == owner_id).with_for_update().first()
+    in_flight = (
+        select(func.count()).select_from(parse_jobs)
+        .where(parse_jobs.c.owner_id == owner_id, parse_jobs.c.status.in_([QUEUED, RUNNING]))
+        .scalar_subquery()
+    )
+    job_id = uuid.uuid4().hex
+    row = select(
+        literal(job_id), literal(owner_id), literal(QUEUED), literal(pdf_bytes, LargeBinary), literal(_now(), DateTime),
+    ).where(_queued_count() < JOB_QUEUE_MAX_DEPTH, in_flight < JOB_QUEUE_MAX_PER_USER)
+    inserted = db.execute(parse_jobs.insert().from_select(["id", "owner_id", "status", "pdf_data", "created_at"], row)).rowcount
+    db.commit()
+    if not inserted:
+        if db.execute(select(_queued_count())).scalar() >= JOB_QUEUE_MAX_DEPTH:
+            raise QueueFullError()
+        raise UserQueueLimitError()
+    return db.get(database.ParseJob, job_id)
+
+def get_job(db: Session, job_id: str, owner_id: int) -> Optional[database.ParseJob]:
+    return db.query(database.ParseJob).filter(database.ParseJob.id == job_id, database.ParseJob.owner_id == owner_id).first()
+
+def job_status(job: database.ParseJob) -> dict:
+    return {"job_id": job.id, "status": job.status, "result": job.result, "error": job.error}
+
+def claim_next_job(db: Session) -> Optional[database.ParseJob]:
+    """
+    Atomically moves one queued job to running and returns it.
+    Among the oldest queued jobs, users with the fewest jobs already running go first, so one
+    user's burst of uploads can't starve everyone else.
+    """
+    running = dict(
+        db.query(database.ParseJob.owner_id, func.count(database.ParseJob.id))
+        .filter(database.ParseJob.status == RUNNING)
+        .group_by(database.ParseJob.owner_id)
+        .all()
+    )
+    candidates = (
+        db.query(database.ParseJob.id, database.ParseJob.owner_id)
+        .filter(database.ParseJob.status == QUEUED)
+        .order_by(database.ParseJob.created_at)
+        .limit(JOB_FAIRNESS_WINDOW)
+        .all()
+    )
+    # sorted() is stable, so jobs from equally loaded users keep their queue order.
+    for job_id, owner_id in sorted(candidates, key=lambda c: running.get(c.owner_id, 0)):
+        claimed = (
+            db.query(database.ParseJob)
+            .filter(database.ParseJob.id == job_id, database.ParseJob.status == QUEUED)
+            .update({"status": RUNNING, "started_at": _now()}, synchronize_session=False)
+        )
+        db.commit()
+        if claimed:
+            return db.get(database.ParseJob, job_id)
+    return None
+
+def finish_job(db: Session, job_id: str, result):
+    job = db.get(database.ParseJob, job_id)
+    if job is None:
+        return
+    if isinstance(result, dict) and "error" in result:
+        job.status = FAILED
+        job.error = result["error"]
+    else:
+        job.status = DONE
+        job.result = result
+    job.pdf_data = None
+    job.finished_at = _now()
+    db.commit()
+
+def requeue_stale_jobs(db: Session) -> int:
+    cutoff = _now() - timedelta(seconds=JOB_STALE_AFTER_SECONDS)
+    count = (
+        db.query(database.ParseJob)
+        .filter(database.ParseJob.status == RUNNING, database.ParseJob.started_at < cutoff)
+        .update({"status": QUEUED, "started_at": None}, synchronize_session=False)
+    )
+    db.commit()
+    return count
+
+def purge_finished_jobs(db: Session) -> int:
+    """Deletes done and failed jobs that finished more than JOB_RETENTION_SECONDS ago."""
+    cutoff = _now() - timedelta(seconds=JOB_RETENTION_SECONDS)
+    count = (
+        db.query(database.ParseJob)
+        .filter(database.ParseJob.status.in_([DONE, FAILED]), database.ParseJob.finished_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return count
+
+# --- Workers ---
+def _claim():
+    db = database.SessionLocal()
+    try:
+        job = claim_next_job(db)
+        return (job.id, job.owner_id, job.pdf_data) if job else None
+    finally:
+        db.close()
+
+def _finish(job_id, result):
+    db = database.SessionLocal()
+    try:
+        finish_job(db, job_id, result)
+    finally:
+        db.close()
+
+def _maintain():
+    db = database.SessionLocal()
+    try:
+        return requeue_stale_jobs(db), purge_finished_jobs(db)
+    finally:
+        db.close()
+
+async def _store_outcome(job_id, result):
+    """
+    Saves a job's result. If that fails the job is marked failed instead; if the database can't
+    take that either, the job stays running until the stale check requeues it.
+    """
+    try:
+        await asyncio.to_thread(_finish, job_id, result)
+        return
+    except Exception as e:
+        print(f"Parse worker failed to save job {job_id}: {e}")
+    try:
+        await asyncio.to_thread(_finish, job_id, {"error": "Failed to save the parse result. Please try again."})
+    except Exception as e:
+        print(f"Parse worker failed to mark job {job_id} as failed: {e}")
+
+async def run_worker(stop_event: asyncio.Event):
+    while not stop_event.is_set():
+        try:
+            claimed = await asyncio.to_thread(_claim)
+        except Exception as e:
+            print(f"Parse worker failed to claim a job: {e}")
+            claimed = None
+        if claimed is None:
+            try:
+                await asyncio.wait_for(stop_event.wait(), JOB_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        job_id, owner_id, pdf_bytes = claimed
+        try:
+            result = await upload_dedup.aparse_resume(owner_id, pdf_bytes)
+        except Exception as e:
+            result = {"error": f"Failed to parse resume: {e}"}
+        await _store_outcome(job_id, result)
+
+async def run_maintenance(stop_event: asyncio.Event):
+    """Requeues stale jobs and purges old finished ones, now and then every JOB_MAINTENANCE_INTERVAL_SECONDS."""
+    while not stop_event.is_set():
+        try:
+            requeued, purged = await asyncio.to_thread(_maintain)
+            if requeued or purged:
+                print(f"Parse jobs: requeued {requeued} stale, purged {purged} finished.")
+        except Exception as e:
+            print(f"Parse job maintenance failed: {e}")
+        try:
+            await asyncio.wait_for(stop_event.wait(), JOB_MAINTENANCE_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+def start_workers(count: int):
+    """Starts in-process workers and the maintenance loop on the running event loop. Returns a stop callback."""
+    stop_event = asyncio.Event()
+    tasks = [asyncio.create_task(run_worker(stop_event)) for _ in range(count)]
+    tasks.append(asyncio.create_task(run_maintenance(stop_event)))
+
+    async def stop():
+        stop_event.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return stop
+
+async def _run_standalone(count: int):
+    stop = start_workers(count)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run resume parse workers outside the API process.")
+    parser.add_argument("--workers", type=int, default=max(JOB_WORKERS, 1))
+    args = parser.parse_args()
+    database.init_db()
+    print(f"Starting {args.workers} parse worker(s) against {database.SQLALCHEMY_DATABASE_URL}")
+    try:
+        asyncio.run(_run_standalone(args.workers))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,255 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+# --- Configuration ---
+CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+MEMORY_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_MAX_ENTRIES", "512"))
+PERSISTENT_MAX_ENTRIES = int(os.getenv("LLM_CACHE_PERSISTENT_MAX_ENTRIES", "10000"))
+# Defaults to backend/llm_cache.db whatever the working directory; set to an empty string to disable the persistent tier.
+CACHE_DB_PATH = os.getenv("LLM_CACHE_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_cache.db"))
+# Non-zero temperature calls are meant to vary, so they skip the cache unless explicitly opted in.
+ALLOW_NONZERO_TEMPERATURE = os.getenv("LLM_CACHE_ALLOW_NONZERO_TEMPERATURE", "0") == "1"
+
+def make_cache_key(model: str, temperature: float, prompt_text: str, schema: Optional[str] = None) -> str:
+    """Builds a content-addressed key from everything that determines an LLM response."""
+    payload = json.dumps(
+        {"model": model, "temperature": float(temperature or 0.0), "prompt": prompt_text, "schema": schema or ""},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# --- Cache Tiers ---
+class MemoryTier:
+    """In-process LRU tier. Values are stored serialized so callers can't mutate cached entries."""
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, created_at = entry
+            if time.time() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, created_at: Optional[float] = None):
+        with self._lock:
+            self._entries[key] = (value, created_at or time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class SQLiteTier:
+    """
+    Persistent tier backed by a local SQLite file, evicted by TTL and least-recent access.
+
+    Hits don't write: their access times are buffered and written in one batch every
+    ACCESS_FLUSH_ENTRIES hits or ACCESS_FLUSH_SECONDS, or with the next set(). Eviction runs every
+    EVICT_EVERY_SETS sets, so the file may briefly hold that many entries over max_entries.
+    """
+    ACCESS_FLUSH_ENTRIES = 256
+    ACCESS_FLUSH_SECONDS = 30.0
+    EVICT_EVERY_SETS = 64
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: int):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._accessed = {}
+        self._last_flush = time.time()
+        self._sets_since_evict = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # Same settings as the app database: no fsync per commit, and a crash loses at most the last few entries.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed_at ON llm_cache (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._accessed[key] = now
+            if len(self._accessed) >= self.ACCESS_FLUSH_ENTRIES or now - self._last_flush >= self.ACCESS_FLUSH_SECONDS:
+                self._write_accessed(now)
+                self._conn.commit()
+            return value, created_at
+
+    def _write_accessed(self, now: float):
+        """Writes the buffered access times; the caller commits. Expects the lock to be held."""
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()],
+            )
+            self._accessed.clear()
+        self._last_flush = now
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._sets_since_evict += 1
+            if self._sets_since_evict >= self.EVICT_EVERY_SETS:
+                # Eviction ranks by accessed_at, so the buffered access times go in first.
+                self._write_accessed(now)
+                self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    "SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                self._sets_since_evict = 0
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._accessed.clear()
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+# --- Two-Tier Response Cache ---
+class ResponseCache:
+    """
+    Looks up the memory tier first, then the persistent tier (promoting hits back into memory).
+    Only JSON-serializable responses are cached; error payloads are never stored.
+    """
+    def __init__(self, memory: Optional[MemoryTier] = None, persistent: Optional[SQLiteTier] = None,
+                 enabled: bool = True, allow_nonzero_temperature: bool = False):
+        self.memory = memory
+        self.persistent = persistent
+        self.enabled = enabled
+        self.allow_nonzero_temperature = allow_nonzero_temperature
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "persistent_hits": 0, "misses": 0, "bypassed": 0, "stores": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def should_cache(self, temperature: float, allow_nonzero_temperature: bool = False) -> bool:
+        """Returns False (and records a bypass) when the call must go straight to the LLM."""
+        if not self.enabled:
+            return False
+        if (temperature or 0.0) > 0.0 and not (allow_nonzero_temperature or self.allow_nonzero_temperature):
+            self._count("bypassed")
+            return False
+        return True
+
+    def get(self, key: str) -> Optional[Any]:
+        if self.memory is not None:
+            value = self.memory.get(key)
+            if value is not None:
+                self._count("memory_hits")
+                return json.loads(value)
+        if self.persistent is not None:
+            row = self.persistent.get(key)
+            if row is not None:
+                value, created_at = row
+                if self.memory is not None:
+                    self.memory.set(key, value, created_at=created_at)
+                self._count("persistent_hits")
+                return json.loads(value)
+        self._count("misses")
+        return None
+
+    def set(self, key: str, response: Any):
+        if isinstance(response, dict) and "error" in response:
+            return
+        try:
+            value = json.dumps(response)
+        except (TypeError, ValueError):
+            return
+        if self.memory is not None:
+            self.memory.set(key, value)
+        if self.persistent is not None:
+            self.persistent.set(key, value)
+        self._count("stores")
+
+    def clear(self):
+        for tier in (self.memory, self.persistent):
+            if tier is not None:
+                tier.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters)
+        hits = stats["memory_hits"] + stats["persistent_hits"]
+        lookups = hits + stats["misses"]
+        stats["hits"] = hits
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        stats["memory_entries"] = len(self.memory) if self.memory is not None else 0
+        stats["persistent_entries"] = len(self.persistent) if self.persistent is not None else 0
+        return stats
+
+def _build_default_cache() -> ResponseCache:
+    persistent = None
+    if CACHE_ENABLED and CACHE_DB_PATH:
+        try:
+            persistent = SQLiteTier(CACHE_DB_PATH, PERSISTENT_MAX_ENTRIES, CACHE_TTL_SECONDS)
+        except sqlite3.Error as e:
+            print(f"LLM cache: persistent tier unavailable ({e}). Using memory only.")
+    return ResponseCache(
+        memory=MemoryTier(MEMORY_MAX_ENTRIES, CACHE_TTL_SECONDS),
+        persistent=persistent,
+        enabled=CACHE_ENABLED,
+        allow_nonzero_temperature=ALLOW_NONZERO_TEMPERATURE,
+    )
+
+# Built on first use, so importing this module (e.g. in a pool worker) never opens the cache file.
+response_cache = None
+_response_cache_lock = threading.Lock()
+
+def set_response_cache(cache: ResponseCache):
+    """Swaps in a different cache implementation (e.g. a shared KV store or a no-op for tests)."""
+    global response_cache
+    response_cache = cache
+
+def get_response_cache() -> ResponseCache:
+    global response_cache
+    if response_cache is None:
+        with _response_cache_lock:
+            if response_cache is None:
+                response_cache = _build_default_cache()
+    return response_cache
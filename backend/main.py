@@ -1,13 +1,19 @@
-from fastapi import FastAPI, HTTPException, Depends, status, UploadFile, File
+from fastapi import FastAPI, HTTPException, Depends, status, UploadFile, File, Header, Response, BackgroundTasks, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Dict
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from typing import List, Dict, Optional
 import json
+import math
+import itertools
+import tempfile
 
-from . import database, schemas, auth, ai_utils
+from . import database, schemas, auth, passwords, ai_utils, jobs, pdf_text, pdf_render, pdf_batch, resume_history, upload_dedup, bulk, process_pools
 
-database.Base.metadata.create_all(bind=database.engine)
 app = FastAPI()
 
 app.add_middleware(
@@ -18,27 +24,179 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def create_tables():
+    """Creates missing tables once per worker at startup (skipped when DB_AUTO_CREATE=0)."""
+    if database.DB_AUTO_CREATE:
+        database.init_db()
+
+@app.on_event("startup")
+def warm_ai_chains():
+    """Builds the LLM clients and prompt chains once per worker instead of once per request."""
+    api_key = ai_utils.get_api_key()
+    if api_key:
+        ai_utils.chain_registry.warm(api_key)
+
+@app.on_event("startup")
+async def start_parse_workers():
+    """Starts the in-process resume parse workers (disabled when PARSE_JOB_WORKERS=0)."""
+    if jobs.JOB_WORKERS > 0:
+        app.state.stop_parse_workers = jobs.start_workers(jobs.JOB_WORKERS)
+
+@app.on_event("shutdown")
+async def stop_parse_workers():
+    stop = getattr(app.state, "stop_parse_workers", None)
+    if stop is not None:
+        await stop()
+
+@app.on_event("shutdown")
+def stop_process_pools():
+    """Stops the PDF text, PDF render and password hashing pools."""
+    process_pools.shutdown_all()
+
+@app.on_event("shutdown")
+async def close_async_engines():
+    await database.dispose_async_engines()
+
 @app.post("/signup", response_model=schemas.User)
-def signup(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
+async def signup(user: schemas.UserCreate, db = Depends(database.get_session)):
     """Endpoint to create a new user account."""
-    db_user = auth.get_user_by_email(db, email=user.email)
+    db_user = await auth.aget_user_by_email(db, user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    return auth.create_user(db=db, user=user)
+    try:
+        return await auth.acreate_user(db=db, user=user)
+    except passwords.PasswordPoolBusy:
+        raise HTTPException(status_code=503, detail="The server is busy. Please try again shortly.")
 
 @app.post("/token", response_model=schemas.Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db = Depends(database.get_session)):
     """Endpoint for user login. Returns a JWT access token."""
-    user = auth.authenticate_user(db, email=form_data.username, password=form_data.password)
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = auth.login_limiter.retry_after(client_ip, form_data.username)
+    if retry_after:
+        raise HTTPException(status_code=429, detail="Too many failed login attempts. Please try again later.", headers={"Retry-After": str(math.ceil(retry_after))})
+    try:
+        user = await auth.aauthenticate_user(db, email=form_data.username, password=form_data.password)
+    except passwords.PasswordPoolBusy:
+        raise HTTPException(status_code=503, detail="The server is busy. Please try again shortly.")
     if not user:
+        auth.login_limiter.record_failure(client_ip, form_data.username)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect Email or Password")
-    access_token = auth.create_access_token(data={"sub": user.email})
+    auth.login_limiter.record_success(form_data.username)
+    access_token = auth.create_access_token(data={"sub": user.email, "uid": user.id})
     return {"access_token": access_token, "token_type": "bearer"}
 
-@app.get("/resume/", response_model=schemas.ResumeData)
-def get_resume_data(current_user: schemas.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
-    """Protected endpoint to retrieve a user's resume data."""
-    db_resume = db.query(database.Resume).filter(database.Resume.owner_id == current_user.id).first()
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """Checks an If-None-Match or If-Match header value against an ETag."""
+    if not header:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+def _resume_etag(version: Optional[int]) -> str:
+    return f'"{version or 0}"'
+
+RESUME_CONFLICT = "Your resume was changed in another session. Reload it to get the latest version."
+
+def _check_resume_version(db_resume, if_match: Optional[str]):
+    """Rejects a write made against an older version than the stored one (If-Match)."""
+    if if_match and not _etag_matches(if_match, _resume_etag(db_resume.version if db_resume else 0)):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=RESUME_CONFLICT)
+
+def _commit_resume(db: Session, db_resume, response: Response):
+    """Commits a resume write, sets the new ETag and returns the new version. Loses to a concurrent write (or first save) with a 409."""
+    try:
+        db.flush()
+        version = db_resume.version
+        db.commit()
+    except (StaleDataError, IntegrityError):
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=RESUME_CONFLICT)
+    response.headers["ETag"] = _resume_etag(version)
+    return version
+
+def _stored_resume_data(db_resume) -> dict:
+    data = db_resume.resume_data if db_resume and db_resume.resume_data else {}
+    return json.loads(data) if isinstance(data, str) else data
+
+# --- Async Resume Endpoints (DB_ASYNC=1) ---
+# Registered ahead of the sync handlers below, so they serve /resume/ when enabled: requests then
+# wait on the database on the event loop instead of holding a threadpool thread each.
+if database.DB_ASYNC:
+    async def _acommit_resume(db, db_resume, response: Response):
+        """_commit_resume for an AsyncSession."""
+        try:
+            await db.flush()
+            version = db_resume.version
+            await db.commit()
+        except (StaleDataError, IntegrityError):
+            await db.rollback()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=RESUME_CONFLICT)
+        response.headers["ETag"] = _resume_etag(version)
+        return version
+
+    @app.get("/resume/", response_model=schemas.ResumeData)
+    async def aget_resume_data(response: Response, if_none_match: Optional[str] = Header(None), user_and_resume = Depends(auth.aget_current_user_and_resume_for_read), db = Depends(database.get_async_read_db)):
+        """Async get_resume_data."""
+        current_user, db_resume = user_and_resume
+        etag = _resume_etag(db_resume.version if db_resume else 0)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        if db_resume:
+            await database.aload_document(db, db_resume)
+        return _stored_resume_data(db_resume) or schemas.ResumeData()
+
+    @app.put("/resume/", response_model=schemas.ResumeData)
+    async def aupdate_resume_data(resume_data: schemas.ResumeData, response: Response, background_tasks: BackgroundTasks, if_match: Optional[str] = Header(None), user_and_resume = Depends(auth.aget_current_user_and_resume), db = Depends(database.get_async_db)):
+        """Async update_resume_data."""
+        current_user, db_resume = user_and_resume
+        _check_resume_version(db_resume, if_match)
+        if not db_resume:
+            db_resume = database.Resume(owner_id=current_user.id)
+            db.add(db_resume)
+
+        previous = _stored_resume_data(db_resume)
+        current = resume_data.dict()
+        db_resume.resume_data = current
+        version = await _acommit_resume(db, db_resume, response)
+        background_tasks.add_task(resume_history.record, current_user.id, version, previous, current)
+        return current
+
+    @app.patch("/resume/", response_model=schemas.ResumePatchResult)
+    async def apatch_resume_data(changes: schemas.ResumePatch, response: Response, background_tasks: BackgroundTasks, if_match: Optional[str] = Header(None), user_and_resume = Depends(auth.aget_current_user_and_resume), db = Depends(database.get_async_db)):
+        """Async patch_resume_data."""
+        current_user, db_resume = user_and_resume
+        updates = {key: value for key, value in changes.dict(exclude_unset=True).items() if value is not None}
+        _check_resume_version(db_resume, if_match)
+        if not updates:
+            version = db_resume.version if db_resume else 0
+            response.headers["ETag"] = _resume_etag(version)
+            return {"updated": [], "version": version}
+        if not db_resume:
+            db_resume = database.Resume(owner_id=current_user.id)
+            db.add(db_resume)
+
+        previous = _stored_resume_data(db_resume)
+        merged = {**previous, **updates}
+        db_resume.resume_data = merged
+        version = await _acommit_resume(db, db_resume, response)
+        background_tasks.add_task(resume_history.record, current_user.id, version, previous, merged)
+        return {"updated": sorted(updates), "version": version}
+
+@app.get("/resume/", response_model=schemas.ResumeData, include_in_schema=not database.DB_ASYNC)
+def get_resume_data(response: Response, if_none_match: Optional[str] = Header(None), user_and_resume = Depends(auth.get_current_user_and_resume_for_read), db: Session = Depends(database.get_read_db)):
+    """Protected endpoint to retrieve a user's resume data. Supports If-None-Match."""
+    # The dependency loads only the version, so an unchanged resume never loads its JSON.
+    current_user, db_resume = user_and_resume
+    etag = _resume_etag(db_resume.version if db_resume else 0)
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    if db_resume:
+        database.load_document(db, db_resume)
+
     if not db_resume or not db_resume.resume_data:
         return schemas.ResumeData()
     
@@ -47,34 +205,184 @@ def get_resume_data(current_user: schemas.User = Depends(auth.get_current_user),
         return json.loads(db_resume.resume_data)
     return db_resume.resume_data
 
-@app.put("/resume/", response_model=schemas.ResumeData)
-def update_resume_data(resume_data: schemas.ResumeData, current_user: schemas.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
-    """Protected endpoint to update a user's resume data."""
-    db_resume = db.query(database.Resume).filter(database.Resume.owner_id == current_user.id).first()
+@app.put("/resume/", response_model=schemas.ResumeData, include_in_schema=not database.DB_ASYNC)
+def update_resume_data(resume_data: schemas.ResumeData, response: Response, background_tasks: BackgroundTasks, if_match: Optional[str] = Header(None), user_and_resume = Depends(auth.get_current_user_and_resume), db: Session = Depends(database.get_db)):
+    """Protected endpoint to update a user's resume data. Returns 409 if If-Match names a stale version."""
+    current_user, db_resume = user_and_resume
+    _check_resume_version(db_resume, if_match)
     if not db_resume:
         db_resume = database.Resume(owner_id=current_user.id)
         db.add(db_resume)
     
+    previous = _stored_resume_data(db_resume)
     db_resume.resume_data = resume_data.dict()
-    db.commit()
+    version = _commit_resume(db, db_resume, response)
+    background_tasks.add_task(resume_history.record, current_user.id, version, previous, resume_data.dict())
     db.refresh(db_resume)
     return db_resume.resume_data
 
+@app.patch("/resume/", response_model=schemas.ResumePatchResult, include_in_schema=not database.DB_ASYNC)
+def patch_resume_data(changes: schemas.ResumePatch, response: Response, background_tasks: BackgroundTasks, if_match: Optional[str] = Header(None), user_and_resume = Depends(auth.get_current_user_and_resume), db: Session = Depends(database.get_db)):
+    """Protected endpoint to replace only the resume sections included in the request. Returns 409 if If-Match names a stale version."""
+    current_user, db_resume = user_and_resume
+    updates = {key: value for key, value in changes.dict(exclude_unset=True).items() if value is not None}
+    _check_resume_version(db_resume, if_match)
+    if not updates:
+        version = db_resume.version if db_resume else 0
+        response.headers["ETag"] = _resume_etag(version)
+        return {"updated": [], "version": version}
+    if not db_resume:
+        db_resume = database.Resume(owner_id=current_user.id)
+        db.add(db_resume)
+
+    previous = _stored_resume_data(db_resume)
+    # Assign a new dict so SQLAlchemy sees the JSON column as changed.
+    merged = {**previous, **updates}
+    db_resume.resume_data = merged
+    version = _commit_resume(db, db_resume, response)
+    background_tasks.add_task(resume_history.record, current_user.id, version, previous, merged)
+    return {"updated": sorted(updates), "version": version}
+
+@app.get("/resume/history/", response_model=List[schemas.ResumeVersionInfo])
+def list_resume_versions(current_user: schemas.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
+    """Protected endpoint to list the stored versions of the user's resume, newest first."""
+    return resume_history.list_versions(db, current_user.id)
+
+@app.get("/resume/history/diff", response_model=schemas.ResumeVersionDiff)
+def diff_resume_versions(from_version: int, to_version: int, current_user: schemas.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
+    """Protected endpoint to compare two stored versions section by section."""
+    diff = resume_history.diff_versions(db, current_user.id, from_version, to_version)
+    if diff is None:
+        raise HTTPException(status_code=404, detail="Version not found")
+    return diff
+
+@app.get("/resume/history/{version}", response_model=schemas.ResumeData)
+def get_resume_version(version: int, current_user: schemas.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
+    """Protected endpoint to retrieve the resume as it was at a stored version."""
+    data = resume_history.get_version(db, current_user.id, version)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Version not found")
+    return data
+
+@app.post("/resume/history/{version}/restore", response_model=schemas.ResumeData)
+def restore_resume_version(version: int, response: Response, background_tasks: BackgroundTasks, if_match: Optional[str] = Header(None), current_user: schemas.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
+    """Protected endpoint to make a stored version the current resume. The restore is itself a new version."""
+    restored = resume_history.get_version(db, current_user.id, version)
+    if restored is None:
+        raise HTTPException(status_code=404, detail="Version not found")
+    db_resume = db.query(database.Resume).filter(database.Resume.owner_id == current_user.id).first()
+    _check_resume_version(db_resume, if_match)
+    if not db_resume:
+        db_resume = database.Resume(owner_id=current_user.id)
+        db.add(db_resume)
+
+    previous = _stored_resume_data(db_resume)
+    db_resume.resume_data = restored
+    new_version = _commit_resume(db, db_resume, response)
+    background_tasks.add_task(resume_history.record, current_user.id, new_version, previous, restored)
+    return restored
+
+@app.get("/resume/pdf")
+async def get_resume_pdf(if_none_match: Optional[str] = Header(None), current_user: schemas.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
+    """Protected endpoint to render the user's stored resume as a PDF. Supports If-None-Match."""
+    db_resume = await run_in_threadpool(lambda: db.query(database.Resume).filter(database.Resume.owner_id == current_user.id).first())
+    resume_data = db_resume.resume_data if db_resume and db_resume.resume_data else {}
+    if isinstance(resume_data, str):
+        resume_data = json.loads(resume_data)
+
+    # The ETag is derived from the inputs, so an unchanged resume is answered before rendering.
+    etag = f'"{pdf_render.render_key(pdf_render.prepare(resume_data))}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    try:
+        _, pdf_bytes = await pdf_render.arender(resume_data)
+    except Exception as e:
+        print(f"Error rendering resume PDF: {e}")
+        raise HTTPException(status_code=500, detail="Failed to render the resume PDF.")
+    headers["Content-Disposition"] = 'inline; filename="resume.pdf"'
+    return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+
+@app.post("/admin/resumes/pdf-batch")
+def export_resume_pdfs(request: schemas.BatchExportRequest, current_user: schemas.User = Depends(auth.get_current_admin)):
+    """Admin endpoint to render many resumes into one streamed ZIP. report.json in the archive lists failures."""
+    count = len(request.user_ids) + len(request.resumes)
+    if count == 0:
+        raise HTTPException(status_code=400, detail="Provide user_ids or resumes to export.")
+    if count > pdf_batch.BATCH_EXPORT_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {pdf_batch.BATCH_EXPORT_MAX_ITEMS} resumes can be exported at once.")
+    items = itertools.chain(pdf_batch.iter_user_resumes(request.user_ids), pdf_batch.iter_resume_models(request.resumes))
+    return StreamingResponse(
+        pdf_batch.export_zip(items, pdf_batch.BatchReport()),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="resumes.zip"'},
+    )
+
+# Import bodies up to this size are buffered in memory; larger ones spill to a temporary file.
+BULK_IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+@app.post("/admin/users/import", response_model=schemas.BulkImportResult)
+async def bulk_import_users(request: Request, bcrypt_rounds: Optional[int] = None, current_user: schemas.User = Depends(auth.get_current_admin)):
+    """Admin endpoint to create users and resumes from an NDJSON body (see backend/bulk.py). Returns per-line failures."""
+    with tempfile.SpooledTemporaryFile(max_size=BULK_IMPORT_SPOOL_BYTES) as body:
+        async for chunk in request.stream():
+            body.write(chunk)
+        body.seek(0)
+        try:
+            return await run_in_threadpool(bulk.import_file, body, bcrypt_rounds)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/admin/users/export")
+def bulk_export_users(include_password_hashes: bool = False, current_user: schemas.User = Depends(auth.get_current_admin)):
+    """Admin endpoint to stream every user and resume as NDJSON."""
+    return StreamingResponse(
+        bulk.iter_export(include_password_hashes),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="users.ndjson"'},
+    )
+
 @app.post("/ai/parse-resume/", response_model=schemas.ResumeData)
-async def parse_resume(file: UploadFile = File(...), current_user: schemas.User = Depends(auth.get_current_user)):
-    """Endpoint to parse an uploaded PDF resume."""
+async def parse_resume(file: UploadFile = File(...), force_refresh: bool = False, current_user: schemas.User = Depends(auth.get_current_user)):
+    """Endpoint to parse an uploaded PDF resume. Repeat uploads are served from stored results unless force_refresh is set."""
     if file.content_type != "application/pdf":
         raise HTTPException(status_code=400, detail="Invalid file type. Please upload a PDF.")
     pdf_bytes = await file.read()
-    parsed_data = ai_utils.parse_resume_from_pdf(pdf_bytes)
+    if len(pdf_bytes) > pdf_text.PDF_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="PDF is too large.")
+    parsed_data = await upload_dedup.aparse_resume(current_user.id, pdf_bytes, force_refresh=force_refresh)
     if isinstance(parsed_data, dict) and "error" in parsed_data:
         raise HTTPException(status_code=500, detail=parsed_data["error"])
     return parsed_data
 
+@app.post("/ai/jobs/parse-resume/", response_model=schemas.JobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def create_parse_job(file: UploadFile = File(...), current_user: schemas.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
+    """Endpoint to queue a PDF resume for parsing. Poll /ai/jobs/{job_id} for the result."""
+    if file.content_type != "application/pdf":
+        raise HTTPException(status_code=400, detail="Invalid file type. Please upload a PDF.")
+    pdf_bytes = await file.read()
+    if len(pdf_bytes) > pdf_text.PDF_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="PDF is too large.")
+    try:
+        job = await run_in_threadpool(jobs.enqueue_parse_job, db, current_user.id, pdf_bytes)
+    except jobs.QueueFullError:
+        raise HTTPException(status_code=503, detail="The parsing queue is full. Please try again shortly.")
+    except jobs.UserQueueLimitError:
+        raise HTTPException(status_code=429, detail="You already have resumes being parsed. Please wait for them to finish.")
+    return jobs.job_status(job)
+
+@app.get("/ai/jobs/{job_id}", response_model=schemas.JobStatus)
+def get_parse_job(job_id: str, current_user: schemas.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
+    """Endpoint to check the status of a queued resume parse."""
+    job = jobs.get_job(db, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return jobs.job_status(job)
+
 @app.post("/ai/generate-summary/", response_model=Dict[str, str])
-def generate_summary_endpoint(request_data: schemas.SummaryRequest, current_user: schemas.User = Depends(auth.get_current_user)):
+async def generate_summary_endpoint(request_data: schemas.SummaryRequest, current_user: schemas.User = Depends(auth.get_current_user)):
     """Endpoint to generate an AI summary for the resume."""
-    summary = ai_utils.generate_summary_from_skills_and_role(
+    summary = await ai_utils.agenerate_summary_from_skills_and_role(
         skills=request_data.skills,
         job_description=request_data.job_description
     )
@@ -82,30 +390,73 @@ def generate_summary_endpoint(request_data: schemas.SummaryRequest, current_user
         raise HTTPException(status_code=500, detail=summary)
     return {"summary": summary}
 
+def _sse(event: str, data) -> str:
+    """Formats one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/ai/generate-summary/stream/")
+async def stream_summary_endpoint(request_data: schemas.SummaryRequest, current_user: schemas.User = Depends(auth.get_current_user)):
+    """Endpoint to stream an AI summary as server-sent events ("token", then "done" or "error")."""
+    async def events():
+        async for chunk in ai_utils.astream_summary(request_data.skills, request_data.job_description):
+            if isinstance(chunk, dict):
+                yield _sse("error", chunk.get("error", "An error occurred."))
+                return
+            yield _sse("token", chunk)
+        yield _sse("done", {})
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 @app.post("/ai/suggest-projects/")
-def suggest_projects_endpoint(skills_data: schemas.SkillList, current_user: schemas.User = Depends(auth.get_current_user)):
+async def suggest_projects_endpoint(skills_data: schemas.SkillList, current_user: schemas.User = Depends(auth.get_current_user)):
     """Endpoint to get AI project suggestions based on skills."""
-    suggestions = ai_utils.suggest_projects(skills_data.skills)
+    suggestions = await ai_utils.asuggest_projects(skills_data.skills)
     if isinstance(suggestions, dict) and "error" in suggestions:
         raise HTTPException(status_code=500, detail=suggestions["error"])
     return suggestions
 
+@app.post("/ai/suggest-projects/stream/")
+async def stream_suggest_projects_endpoint(skills_data: schemas.SkillList, current_user: schemas.User = Depends(auth.get_current_user)):
+    """Endpoint to stream AI project suggestions as server-sent events, one "project" event per idea."""
+    async def events():
+        async for item in ai_utils.astream_project_suggestions(skills_data.skills):
+            if "error" in item:
+                yield _sse("error", item["error"])
+                return
+            yield _sse("project", item)
+        yield _sse("done", {})
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 @app.post("/ai/categorize-skills/")
-def categorize_skills_endpoint(skills: List[str], current_user: schemas.User = Depends(auth.get_current_user)):
+async def categorize_skills_endpoint(skills: List[str], current_user: schemas.User = Depends(auth.get_current_user)):
     """Endpoint to categorize a list of skills."""
-    categorized = ai_utils.categorize_skills(skills)
+    categorized = await ai_utils.acategorize_skills(skills)
     if isinstance(categorized, dict) and "error" in categorized:
         raise HTTPException(status_code=500, detail=categorized["error"])
     return categorized
 
 @app.post("/ai/analyze-github/")
-def analyze_github_endpoint(url_data: Dict[str, str], current_user: schemas.User = Depends(auth.get_current_user)):
+async def analyze_github_endpoint(url_data: Dict[str, str], current_user: schemas.User = Depends(auth.get_current_user)):
     """Endpoint to analyze a GitHub repository."""
     url = url_data.get("url")
     if not url:
         raise HTTPException(status_code=400, detail="URL is required")
-    analysis = ai_utils.analyze_github_repo(url)
+    analysis = await ai_utils.aanalyze_github_repo(url)
     if isinstance(analysis, dict) and "error" in analysis:
         raise HTTPException(status_code=500, detail=analysis["error"])
     return analysis
 
+
+@app.get("/ai/cache-stats/")
+def cache_stats_endpoint(current_user: schemas.User = Depends(auth.get_current_admin)):
+    """Endpoint to report LLM response cache hit/miss counters. Admins only."""
+    return ai_utils.llm_cache.get_response_cache().stats()
+
+@app.get("/db/pool-stats/")
+def db_pool_stats_endpoint(current_user: schemas.User = Depends(auth.get_current_admin)):
+    """Endpoint to report database connection pool checkouts, waits and overflow. Admins only."""
+    return database.pool_stats()
+
+@app.get("/ai/rate-limit-stats/")
+def rate_limit_stats_endpoint(current_user: schemas.User = Depends(auth.get_current_admin)):
+    """Endpoint to report Gemini rate limiter throttling and wait-time metrics. Admins only."""
+    return ai_utils.rate_limit.get_limiter().stats()
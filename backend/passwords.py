@@ -0,0 +1,78 @@
+"""
+Password hashing for the auth endpoints.
+
+bcrypt is deliberately slow, so /signup and /token hash and verify in a dedicated process pool
+instead of the API's threadpool: a login spike then queues behind PASSWORD_HASH_WORKERS
+processes rather than starving every other endpoint. At most PASSWORD_HASH_MAX_PENDING
+operations may be queued; beyond that PasswordPoolBusy is raised and the caller answers 503.
+
+The cost factor is BCRYPT_ROUNDS. Hashes made with any other cost are flagged on login and
+transparently rehashed (see auth.aauthenticate_user).
+
+This module only depends on passlib, so the spawned workers start quickly.
+"""
+import os
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+from passlib.context import CryptContext
+from . import process_pools
+from passlib.hash import bcrypt
+
+# --- Configuration ---
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(PASSWORD_HASH_WORKERS * 8)))
+
+# min/max rounds make passlib flag hashes with a different cost as needing an update.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+class PasswordPoolBusy(Exception):
+    """Raised when PASSWORD_HASH_MAX_PENDING hashing operations are already queued."""
+
+# --- Hashing (run inside the pool) ---
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """Hashes with BCRYPT_ROUNDS, or `rounds` for bulk imports (upgraded on the user's next login)."""
+    if rounds is None or rounds == BCRYPT_ROUNDS:
+        return pwd_context.hash(password)
+    return bcrypt.using(rounds=rounds).hash(password)
+
+def verify_and_update(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """Returns (matches, new_hash); new_hash is set when the stored hash uses an outdated cost."""
+    try:
+        return pwd_context.verify_and_update(password, hashed)
+    except (ValueError, TypeError):
+        # Malformed or empty stored hash.
+        return False, None
+
+# --- Pool ---
+_pending = 0
+_pending_lock = threading.Lock()
+
+def get_executor() -> ProcessPoolExecutor:
+    return process_pools.get_pool("passwords", PASSWORD_HASH_WORKERS)
+
+async def _run(fn, *args):
+    global _pending
+    with _pending_lock:
+        if _pending >= PASSWORD_HASH_MAX_PENDING:
+            raise PasswordPoolBusy()
+        _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(get_executor(), fn, *args)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+async def ahash_password(password: str) -> str:
+    return await _run(hash_password, password)
+
+async def averify_and_update(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    return await _run(verify_and_update, password, hashed)
@@ -0,0 +1,193 @@
+"""
+Batch PDF export for cohorts.
+
+Resumes (stored ones by user id, or ResumeData JSON files) are rendered through the pdf_render
+process pool with a bounded number of renders in flight, and each finished PDF is written
+straight into a ZIP stream. Only the in-flight PDFs and the current ZIP chunk are ever held in
+memory, however many resumes are exported. The archive ends with report.json, which lists the
+throughput and every item that failed.
+
+    python -m backend.pdf_batch --user-ids 1 2 3 -o cohort.zip
+    python -m backend.pdf_batch --all-users --workers 8 -o cohort.zip
+    python -m backend.pdf_batch --files resumes/*.json -o cohort.zip
+"""
+import io
+import os
+import json
+import time
+import zipfile
+import argparse
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator, List, Optional, Tuple
+from . import database, schemas, pdf_render
+
+# Items are (archive name, resume data or None, error or None).
+Item = Tuple[str, Optional[dict], Optional[str]]
+
+# --- Configuration ---
+BATCH_EXPORT_MAX_ITEMS = int(os.getenv("BATCH_EXPORT_MAX_ITEMS", "1000"))
+# How many user ids are loaded from the database per query.
+BATCH_LOAD_CHUNK_SIZE = 200
+
+# --- Inputs ---
+def iter_user_resumes(user_ids: List[int]) -> Iterator[Item]:
+    """Loads stored resumes in chunks of ids, so the whole cohort never sits in memory at once."""
+    db = database.SessionLocal()
+    try:
+        for start in range(0, len(user_ids), BATCH_LOAD_CHUNK_SIZE):
+            chunk = user_ids[start:start + BATCH_LOAD_CHUNK_SIZE]
+            rows = {
+                owner_id: database.load_resume(resume_json, resume_blob)
+                for owner_id, resume_json, resume_blob in db.query(database.Resume.owner_id, database.Resume.resume_json, database.Resume.resume_blob)
+                .filter(database.Resume.owner_id.in_(chunk))
+                .all()
+            }
+            for user_id in chunk:
+                data = rows.get(user_id)
+                if data:
+                    yield f"user-{user_id}.pdf", data, None
+                else:
+                    yield f"user-{user_id}.pdf", None, "No resume stored for this user."
+    finally:
+        db.close()
+
+def all_user_ids() -> List[int]:
+    db = database.SessionLocal()
+    try:
+        return [owner_id for (owner_id,) in db.query(database.Resume.owner_id).order_by(database.Resume.owner_id).all()]
+    finally:
+        db.close()
+
+def iter_json_files(paths: Iterable[str]) -> Iterator[Item]:
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0] + ".pdf"
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                yield name, schemas.ResumeData(**json.load(f)).dict(), None
+        except Exception as e:
+            yield name, None, f"Invalid resume file: {e}"
+
+def iter_resume_models(resumes: List[schemas.ResumeData]) -> Iterator[Item]:
+    for index, resume in enumerate(resumes, start=1):
+        stem = (resume.name or "resume").strip().replace(" ", "_") or "resume"
+        yield f"{index:04d}-{stem}.pdf", resume.dict(), None
+
+# --- Rendering ---
+def render_all(items: Iterable[Item], executor: Executor, max_in_flight: int) -> Iterator[Tuple[str, Optional[bytes], Optional[str]]]:
+    """Yields (name, pdf_bytes, error) in completion order, with at most max_in_flight renders queued."""
+    pending = {}
+
+    def collect(done):
+        for future in done:
+            name = pending.pop(future)
+            try:
+                yield name, future.result(), None
+            except Exception as e:
+                yield name, None, f"Render failed: {e}"
+
+    for name, data, error in items:
+        if error:
+            yield name, None, error
+            continue
+        pending[executor.submit(pdf_render.render_resume, pdf_render.prepare(data))] = name
+        if len(pending) >= max_in_flight:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from collect(done)
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        yield from collect(done)
+
+class BatchReport:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.rendered = 0
+        self.rendered_bytes = 0
+        self.failures = []
+
+    def add(self, name: str, pdf_bytes: Optional[bytes], error: Optional[str]):
+        if error:
+            self.failures.append({"item": name, "error": error})
+        else:
+            self.rendered += 1
+            self.rendered_bytes += len(pdf_bytes)
+
+    def summary(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "rendered": self.rendered,
+            "failed": len(self.failures),
+            "elapsed_seconds": round(elapsed, 3),
+            "pdfs_per_second": round(self.rendered / elapsed, 2) if elapsed else None,
+            "rendered_bytes": self.rendered_bytes,
+            "failures": self.failures,
+        }
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, unseekable sink; zipfile falls back to data descriptors, so entries stream out."""
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> Iterator[bytes]:
+        chunks, self._chunks = self._chunks, []
+        if chunks:
+            yield b"".join(chunks)
+
+def stream_zip(results: Iterable[Tuple[str, Optional[bytes], Optional[str]]], report: BatchReport) -> Iterator[bytes]:
+    """Writes each rendered PDF into a ZIP as it arrives and yields the archive in chunks."""
+    sink = _ChunkSink()
+    seen = set()
+    # PDFs are already compressed, so entries are stored rather than deflated.
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, pdf_bytes, error in results:
+            report.add(name, pdf_bytes, error)
+            if pdf_bytes is not None:
+                unique, n = name, 1
+                while unique in seen:
+                    n += 1
+                    unique = f"{os.path.splitext(name)[0]}-{n}.pdf"
+                seen.add(unique)
+                archive.writestr(unique, pdf_bytes)
+            yield from sink.drain()
+        archive.writestr("report.json", json.dumps(report.summary(), indent=2))
+    yield from sink.drain()
+
+def export_zip(items: Iterable[Item], report: BatchReport, executor: Optional[Executor] = None, max_in_flight: Optional[int] = None) -> Iterator[bytes]:
+    executor = executor or pdf_render.get_executor()
+    max_in_flight = max_in_flight or 2 * pdf_render.PDF_RENDER_WORKERS
+    return stream_zip(render_all(items, executor, max_in_flight), report)
+
+# --- CLI ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render many resumes to PDF and write them into one ZIP.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--user-ids", type=int, nargs="+", help="render these users' stored resumes")
+    source.add_argument("--all-users", action="store_true", help="render every stored resume")
+    source.add_argument("--files", nargs="+", help="render ResumeData JSON files")
+    parser.add_argument("-o", "--output", default="resumes.zip")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    if args.files:
+        items = iter_json_files(args.files)
+    else:
+        items = iter_user_resumes(all_user_ids() if args.all_users else args.user_ids)
+
+    report = BatchReport()
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        with open(args.output, "wb") as f:
+            for chunk in export_zip(items, report, executor, 2 * args.workers):
+                f.write(chunk)
+
+    summary = report.summary()
+    for failure in summary["failures"]:
+        print(f"FAILED {failure['item']}: {failure['error']}")
+    print(f"Rendered {summary['rendered']} PDFs ({summary['failed']} failed) in {summary['elapsed_seconds']}s "
+          f"- {summary['pdfs_per_second']} PDFs/s, written to {args.output}")
@@ -0,0 +1,78 @@
+"""
+Server-side resume PDF rendering.
+
+Renders go through the frontend's ReportLab template (frontend/templates/template1.py, via
+modules.resume_generator.render_pdf) so the API and the Streamlit app produce identical PDFs.
+They run in a process pool, keeping ReportLab's CPU work off the event loop and out of the
+API process's GIL, and the results are cached in memory under a key derived from the resume
+JSON, the section order and the template version. The same key is used as the response ETag.
+"""
+import os
+import sys
+import json
+import asyncio
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
+from . import process_pools
+from .llm_cache import MemoryTier
+
+# --- Configuration ---
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+PDF_CACHE_MAX_ENTRIES = int(os.getenv("PDF_CACHE_MAX_ENTRIES", "256"))
+PDF_CACHE_TTL_SECONDS = int(os.getenv("PDF_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "frontend")
+TEMPLATE_SOURCES = (
+    os.path.join(FRONTEND_DIR, "templates", "template1.py"),
+    os.path.join(FRONTEND_DIR, "modules", "resume_generator.py"),
+)
+DEFAULT_SECTION_ORDER = ["Summary", "Education", "Projects", "Skills", "Internship Experience", "Work Experience", "Achievements", "Activities & Leadership"]
+
+def _template_version() -> str:
+    """Hash of the template sources, so editing the template invalidates every cached render."""
+    digest = hashlib.sha256()
+    for path in TEMPLATE_SOURCES:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+TEMPLATE_VERSION = _template_version()
+
+def prepare(resume_data: dict) -> dict:
+    """Fills in the default section order the Streamlit app applies to resumes without one."""
+    data = dict(resume_data or {})
+    if not data.get("section_order"):
+        data["section_order"] = DEFAULT_SECTION_ORDER
+    return data
+
+def render_key(resume_data: dict) -> str:
+    """Content-addressed key (and ETag) for the rendered PDF of a prepared resume."""
+    payload = json.dumps(
+        {"resume": resume_data, "section_order": resume_data.get("section_order"), "template": TEMPLATE_VERSION},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# --- Rendering ---
+def render_resume(resume_data: dict) -> bytes:
+    """Runs inside a pool process; the template modules import each other relative to frontend/."""
+    if FRONTEND_DIR not in sys.path:
+        sys.path.insert(0, FRONTEND_DIR)
+    from modules.resume_generator import render_pdf
+    return render_pdf(resume_data)
+
+def get_executor() -> ProcessPoolExecutor:
+    return process_pools.get_pool("pdf_render", PDF_RENDER_WORKERS)
+
+_cache = MemoryTier(PDF_CACHE_MAX_ENTRIES, PDF_CACHE_TTL_SECONDS)
+
+async def arender(resume_data: dict) -> Tuple[str, bytes]:
+    """Returns (key, pdf_bytes), rendering in the process pool only on a cache miss."""
+    data = prepare(resume_data)
+    key = render_key(data)
+    pdf_bytes = _cache.get(key)
+    if pdf_bytes is None:
+        pdf_bytes = await asyncio.get_running_loop().run_in_executor(get_executor(), render_resume, data)
+        _cache.set(key, pdf_bytes)
+    return key, pdf_bytes
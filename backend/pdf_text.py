@@ -0,0 +1,101 @@
+"""
+Text extraction for uploaded PDF resumes.
+
+Engines, selected with PDF_TEXT_ENGINE:
+    pymupdf     fastest; the default when installed ("auto")
+    pdfplumber  layout-aware word grouping, slower
+    pypdf       pure-Python fallback, used whenever the chosen engine fails
+
+Uploads above PDF_MAX_BYTES are rejected and only the first PDF_MAX_PAGES pages are read.
+Documents with at least PDF_PARALLEL_MIN_PAGES pages are split into page ranges that are
+extracted in a process pool (each worker opens its own copy of the document, since none of the
+engines are safe to share across threads and pdfplumber/pypdf are GIL-bound anyway).
+Pages are joined with a newline so the last line of one page never runs into the next.
+"""
+import os
+from io import BytesIO
+from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from . import process_pools
+
+# --- Configuration ---
+PDF_TEXT_ENGINE = os.getenv("PDF_TEXT_ENGINE", "auto").lower()
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "10"))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "4"))
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", "4"))
+
+ENGINES = ("pymupdf", "pdfplumber", "pypdf")
+
+class PDFTooLargeError(ValueError):
+    """Raised when an upload exceeds PDF_MAX_BYTES."""
+
+# --- Engines ---
+def _import_pymupdf():
+    try:
+        import pymupdf
+    except ImportError:
+        import fitz as pymupdf
+    return pymupdf
+
+def _page_count(engine: str, pdf_bytes: bytes) -> int:
+    if engine == "pymupdf":
+        with _import_pymupdf().open(stream=pdf_bytes, filetype="pdf") as doc:
+            return doc.page_count
+    if engine == "pdfplumber":
+        import pdfplumber
+        with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+            return len(pdf.pages)
+    import pypdf
+    return len(pypdf.PdfReader(BytesIO(pdf_bytes)).pages)
+
+def _extract_range(engine: str, pdf_bytes: bytes, start: int, stop: int) -> List[str]:
+    """Extracts pages [start, stop). Module-level so it can run in a worker process."""
+    if engine == "pymupdf":
+        with _import_pymupdf().open(stream=pdf_bytes, filetype="pdf") as doc:
+            return [doc[i].get_text("text") for i in range(start, stop)]
+    if engine == "pdfplumber":
+        import pdfplumber
+        with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+            return [pdf.pages[i].extract_text() or "" for i in range(start, stop)]
+    import pypdf
+    reader = pypdf.PdfReader(BytesIO(pdf_bytes))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+def _get_executor() -> ProcessPoolExecutor:
+    return process_pools.get_pool("pdf_text", PDF_EXTRACT_WORKERS)
+
+def _extract_pages(engine: str, pdf_bytes: bytes, page_count: int, parallel: bool) -> List[str]:
+    if not parallel or page_count < PDF_PARALLEL_MIN_PAGES or PDF_EXTRACT_WORKERS < 2:
+        return _extract_range(engine, pdf_bytes, 0, page_count)
+    chunk = -(-page_count // PDF_EXTRACT_WORKERS)
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    futures = [_get_executor().submit(_extract_range, engine, pdf_bytes, start, stop) for start, stop in ranges]
+    pages = []
+    for future in futures:
+        pages.extend(future.result())
+    return pages
+
+def _candidate_engines(engine: str) -> List[str]:
+    if engine == "auto":
+        return ["pymupdf", "pypdf"]
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown PDF text engine '{engine}'. Choose one of: auto, {', '.join(ENGINES)}.")
+    return [engine] if engine == "pypdf" else [engine, "pypdf"]
+
+# --- Public API ---
+def extract_text(pdf_bytes: bytes, engine: Optional[str] = None, max_pages: Optional[int] = None, parallel: bool = True) -> str:
+    """Returns the text of the first `max_pages` pages, one page per block, separated by newlines."""
+    if len(pdf_bytes) > PDF_MAX_BYTES:
+        raise PDFTooLargeError(f"PDF is larger than {PDF_MAX_BYTES // (1024 * 1024)} MB.")
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    last_error = None
+    for candidate in _candidate_engines((engine or PDF_TEXT_ENGINE).lower()):
+        try:
+            page_count = min(_page_count(candidate, pdf_bytes), max_pages)
+            pages = _extract_pages(candidate, pdf_bytes, page_count, parallel)
+            return "\n".join(page.rstrip("\n") for page in pages)
+        except Exception as e:
+            print(f"PDF text extraction with {candidate} failed: {e}")
+            last_error = e
+    raise last_error
@@ -0,0 +1,39 @@
+"""
+Process pools for the API's CPU-bound work (PDF text extraction, PDF rendering, password hashing).
+
+Each pool is created under its name on first use, so a worker that never renders a PDF never
+starts renderer processes. shutdown_all() stops every pool and runs on app shutdown.
+
+This module only depends on the standard library, so importing it from the pool modules keeps
+the spawned workers' start-up cheap.
+"""
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+_pools: Dict[str, ProcessPoolExecutor] = {}
+_lock = threading.Lock()
+
+def get_pool(name: str, max_workers: int) -> ProcessPoolExecutor:
+    """The pool registered under name, started with max_workers processes if it does not exist yet."""
+    pool = _pools.get(name)
+    if pool is None:
+        with _lock:
+            pool = _pools.get(name)
+            if pool is None:
+                # spawn, not fork: the API process is multi-threaded by the time a pool is first used.
+                pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+                _pools[name] = pool
+    return pool
+
+def shutdown(name: str):
+    """Stops the named pool without waiting for running tasks; the next get_pool starts a new one."""
+    with _lock:
+        pool = _pools.pop(name, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def shutdown_all():
+    for name in list(_pools):
+        shutdown(name)
@@ -0,0 +1,242 @@
+"""
+Process-wide rate limiting for Gemini calls.
+
+Every ai_utils call takes a token from one shared, adaptive token bucket before it reaches the
+API. Waiters are served strictly by priority (interactive requests before bulk parsing), then
+arrival order. A 429 shrinks the refill rate and pushes the next retry past the server's
+retry hint. A run of consecutive 429s opens a circuit breaker, so callers fail fast instead of
+piling more retries onto an exhausted quota. The same limiter serves threads (acquire) and
+coroutines (aacquire).
+"""
+import os
+import re
+import time
+import heapq
+import random
+import asyncio
+import itertools
+import threading
+from typing import Optional
+try:
+    from google.api_core import exceptions as google_exceptions
+except ImportError:
+    google_exceptions = None
+
+# --- Configuration ---
+RATE_LIMIT_RPS = float(os.getenv("GEMINI_RATE_LIMIT_RPS", "5"))
+RATE_LIMIT_BURST = float(os.getenv("GEMINI_RATE_LIMIT_BURST", "10"))
+RATE_LIMIT_MIN_RPS = float(os.getenv("GEMINI_RATE_LIMIT_MIN_RPS", "0.2"))
+RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("GEMINI_RATE_LIMIT_MAX_WAIT_SECONDS", "30"))
+BREAKER_THRESHOLD = int(os.getenv("GEMINI_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN_SECONDS = float(os.getenv("GEMINI_BREAKER_COOLDOWN_SECONDS", "30"))
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 30.0
+
+# Lower value = served first.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 5
+PRIORITY_BULK = 10
+
+# How often a waiter that isn't at the head of the queue re-checks its turn.
+_WAIT_TICK_SECONDS = 0.05
+
+class RateLimitExceeded(Exception):
+    """Raised when a call can't get a slot: the breaker is open or the wait would be too long."""
+
+# --- Error Inspection ---
+_RETRY_HINT_PATTERNS = [
+    re.compile(r"retry in ([\d.]+)\s*s", re.IGNORECASE),
+    re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+)", re.IGNORECASE),
+    re.compile(r"retry-after:?\s*([\d.]+)", re.IGNORECASE),
+]
+
+_RATE_LIMIT_MESSAGE = re.compile(r"\b429\b|Quota exceeded|RESOURCE_EXHAUSTED")
+_RATE_LIMIT_ERROR_TYPES = (google_exceptions.ResourceExhausted, google_exceptions.TooManyRequests) if google_exceptions else ()
+
+def _status_code(e: Exception) -> Optional[int]:
+    """The HTTP status an error carries on itself or its response, if any."""
+    for value in (getattr(e, "status_code", None), getattr(e, "code", None), getattr(getattr(e, "response", None), "status_code", None)):
+        # grpc errors expose code() as a method; only plain ints are HTTP statuses.
+        if isinstance(value, int):
+            return value
+    return None
+
+def is_rate_limit_error(e: Exception) -> bool:
+    """
+    Error types and status codes decide. The message is only matched when the error (and its
+    cause) carries neither, so a 500 whose text happens to contain "429" isn't counted.
+    """
+    statuses = []
+    for candidate in (e, getattr(e, "__cause__", None)):
+        if candidate is None:
+            continue
+        if isinstance(candidate, _RATE_LIMIT_ERROR_TYPES) or type(candidate).__name__ in ("ResourceExhausted", "TooManyRequests", "RateLimitError"):
+            return True
+        status = _status_code(candidate)
+        if status is not None:
+            statuses.append(status)
+    if statuses:
+        return 429 in statuses
+    return bool(_RATE_LIMIT_MESSAGE.search(str(e)))
+
+def retry_after_hint(e: Exception) -> Optional[float]:
+    """Extracts the server's suggested retry delay in seconds, if the error carries one."""
+    response = getattr(e, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    message = str(e)
+    for pattern in _RETRY_HINT_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            return float(match.group(1))
+    return None
+
+# --- Limiter ---
+class AdaptiveRateLimiter:
+    def __init__(self, rate: float, burst: float, min_rate: float, max_wait: float,
+                 breaker_threshold: int, breaker_cooldown: float):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_wait = max_wait
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._consecutive_throttles = 0
+        self._breaker_open_until = 0.0
+        self._lock = threading.Lock()
+        self._metrics = {
+            "acquired": 0, "waited": 0, "wait_seconds_total": 0.0, "throttled": 0,
+            "rejected_breaker_open": 0, "rejected_timeout": 0, "breaker_trips": 0,
+        }
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _try_take(self, ticket, now) -> float:
+        """Takes a token for `ticket` if it's at the head of the queue. Returns 0 on success, else seconds to wait."""
+        if now < self._breaker_open_until:
+            raise RateLimitExceeded("circuit breaker open")
+        self._refill(now)
+        if self._waiters[0] is ticket:
+            if self._tokens >= 1:
+                heapq.heappop(self._waiters)
+                self._tokens -= 1
+                return 0.0
+            return max((1 - self._tokens) / self.rate, _WAIT_TICK_SECONDS)
+        return _WAIT_TICK_SECONDS
+
+    def _enqueue(self, priority):
+        ticket = [priority, next(self._sequence)]
+        with self._lock:
+            heapq.heappush(self._waiters, ticket)
+        return ticket
+
+    def _abandon(self, ticket, reason):
+        with self._lock:
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+            self._metrics[reason] += 1
+
+    def _poll(self, ticket, started):
+        """One scheduling step shared by acquire/aacquire. Returns seconds to sleep, or 0 once acquired."""
+        now = time.monotonic()
+        with self._lock:
+            try:
+                wait = self._try_take(ticket, now)
+            except RateLimitExceeded:
+                wait = None
+            if wait == 0.0:
+                waited = now - started
+                self._metrics["acquired"] += 1
+                if waited > _WAIT_TICK_SECONDS / 10:
+                    self._metrics["waited"] += 1
+                    self._metrics["wait_seconds_total"] += waited
+                return 0.0
+        if wait is None:
+            self._abandon(ticket, "rejected_breaker_open")
+            raise RateLimitExceeded("Gemini quota exhausted; failing fast while the circuit breaker is open.")
+        if now + wait - started > self.max_wait:
+            self._abandon(ticket, "rejected_timeout")
+            raise RateLimitExceeded("Timed out waiting for a Gemini rate-limit slot.")
+        return wait
+
+    def acquire(self, priority: int = PRIORITY_DEFAULT):
+        started = time.monotonic()
+        ticket = self._enqueue(priority)
+        while True:
+            wait = self._poll(ticket, started)
+            if wait == 0.0:
+                return
+            time.sleep(wait)
+
+    async def aacquire(self, priority: int = PRIORITY_DEFAULT):
+        started = time.monotonic()
+        ticket = self._enqueue(priority)
+        try:
+            while True:
+                wait = self._poll(ticket, started)
+                if wait == 0.0:
+                    return
+                await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            self._abandon(ticket, "rejected_timeout")
+            raise
+
+    def record_success(self):
+        with self._lock:
+            self._consecutive_throttles = 0
+            # Additive increase back towards the configured rate.
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def record_throttle(self, e: Exception, attempt: int) -> float:
+        """Registers a 429 and returns how long the caller should back off before retrying."""
+        hint = retry_after_hint(e)
+        with self._lock:
+            self._metrics["throttled"] += 1
+            self._consecutive_throttles += 1
+            # Multiplicative decrease so every caller in the process slows down, not just this one.
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+            if self._consecutive_throttles >= self.breaker_threshold:
+                self._breaker_open_until = time.monotonic() + max(self.breaker_cooldown, hint or 0.0)
+                self._consecutive_throttles = 0
+                self._metrics["breaker_trips"] += 1
+        # Full jitter keeps concurrent retries from landing in lockstep.
+        backoff = random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+        return max(backoff, hint or 0.0)
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            stats = dict(self._metrics)
+            stats["wait_seconds_total"] = round(stats["wait_seconds_total"], 3)
+            stats["current_rate_rps"] = round(self.rate, 3)
+            stats["queued"] = len(self._waiters)
+            stats["breaker_open"] = now < self._breaker_open_until
+            stats["breaker_retry_in_seconds"] = round(max(0.0, self._breaker_open_until - now), 1)
+        return stats
+
+limiter = AdaptiveRateLimiter(
+    rate=RATE_LIMIT_RPS,
+    burst=RATE_LIMIT_BURST,
+    min_rate=RATE_LIMIT_MIN_RPS,
+    max_wait=RATE_LIMIT_MAX_WAIT_SECONDS,
+    breaker_threshold=BREAKER_THRESHOLD,
+    breaker_cooldown=BREAKER_COOLDOWN_SECONDS,
+)
+
+def get_limiter() -> AdaptiveRateLimiter:
+    return limiter
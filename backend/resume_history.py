@@ -0,0 +1,155 @@
+"""
+Version history for stored resumes.
+
+Each write of a resume is recorded in resume_versions as zlib-compressed JSON, either as a full
+snapshot or as a section-level delta against the version before it. A snapshot is written every
+RESUME_HISTORY_SNAPSHOT_INTERVAL versions, so rebuilding any version reads one snapshot plus at
+most that many small deltas. Whenever a gap is seen (e.g. concurrent writes recorded out of
+order), a snapshot is written instead of a delta, so every chain stays reconstructable.
+
+Recording runs as a background task after the response is sent, so saving the current version
+costs the same as before. Compaction keeps the newest RESUME_HISTORY_MAX_VERSIONS versions per
+user, turning the oldest kept one into a snapshot. It runs after each snapshot, and for
+everyone with:
+
+    python -m backend.resume_history --compact
+"""
+import os
+import json
+import zlib
+import argparse
+from datetime import datetime, timezone
+from typing import List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from . import database
+
+# --- Configuration ---
+HISTORY_ENABLED = os.getenv("RESUME_HISTORY_ENABLED", "1") != "0"
+HISTORY_SNAPSHOT_INTERVAL = int(os.getenv("RESUME_HISTORY_SNAPSHOT_INTERVAL", "10"))
+HISTORY_MAX_VERSIONS = int(os.getenv("RESUME_HISTORY_MAX_VERSIONS", "50"))
+
+SNAPSHOT = "snapshot"
+DELTA = "delta"
+
+Version = database.ResumeVersion
+
+def _now():
+    return datetime.now(timezone.utc)
+
+def _pack(obj) -> bytes:
+    return zlib.compress(json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+
+def _unpack(data: bytes):
+    return json.loads(zlib.decompress(data))
+
+# --- Deltas ---
+def diff_sections(old: dict, new: dict) -> dict:
+    """Section-level delta: sections whose value changed, and sections that were removed."""
+    return {
+        "set": {key: value for key, value in new.items() if old.get(key) != value},
+        "unset": [key for key in old if key not in new],
+    }
+
+def apply_delta(data: dict, delta: dict) -> dict:
+    data = {**data, **delta["set"]}
+    for key in delta["unset"]:
+        data.pop(key, None)
+    return data
+
+# --- Recording ---
+def record(owner_id: int, version: int, previous: Optional[dict], current: dict):
+    """Stores `current` as `version`. `previous` must be the resume as it was at version - 1."""
+    if not HISTORY_ENABLED:
+        return
+    db = database.SessionLocal()
+    try:
+        owned = db.query(Version).filter(Version.owner_id == owner_id)
+        latest = owned.with_entities(func.max(Version.version)).scalar()
+        last_snapshot = owned.filter(Version.kind == SNAPSHOT).with_entities(func.max(Version.version)).scalar()
+        if latest == version - 1 and last_snapshot is not None and version - last_snapshot < HISTORY_SNAPSHOT_INTERVAL:
+            kind, payload = DELTA, diff_sections(previous or {}, current)
+        else:
+            kind, payload = SNAPSHOT, current
+        db.add(Version(owner_id=owner_id, version=version, kind=kind, data=_pack(payload), created_at=_now()))
+        db.commit()
+        if kind == SNAPSHOT:
+            compact(db, owner_id)
+    except Exception as e:
+        db.rollback()
+        print(f"Failed to record resume version {version} for user {owner_id}: {e}")
+    finally:
+        db.close()
+
+# --- Reading ---
+def list_versions(db: Session, owner_id: int) -> List[dict]:
+    rows = (
+        db.query(Version.version, Version.kind, Version.created_at, func.length(Version.data))
+        .filter(Version.owner_id == owner_id)
+        .order_by(Version.version.desc())
+        .all()
+    )
+    return [{"version": v, "kind": kind, "created_at": created_at, "stored_bytes": size} for v, kind, created_at, size in rows]
+
+def get_version(db: Session, owner_id: int, version: int) -> Optional[dict]:
+    """Rebuilds the resume as it was at `version`, or None if that version isn't stored."""
+    owned = db.query(Version).filter(Version.owner_id == owner_id)
+    base = owned.filter(Version.kind == SNAPSHOT, Version.version <= version).order_by(Version.version.desc()).first()
+    if base is None:
+        return None
+    rows = owned.filter(Version.version > base.version, Version.version <= version).order_by(Version.version).all()
+    if [row.version for row in rows] != list(range(base.version + 1, version + 1)):
+        return None
+    data = _unpack(base.data)
+    for row in rows:
+        data = _unpack(row.data) if row.kind == SNAPSHOT else apply_delta(data, _unpack(row.data))
+    return data
+
+def diff_versions(db: Session, owner_id: int, from_version: int, to_version: int) -> Optional[dict]:
+    """Per-section before/after values for every section that differs between two versions."""
+    old, new = get_version(db, owner_id, from_version), get_version(db, owner_id, to_version)
+    if old is None or new is None:
+        return None
+    changes = {key: {"from": old.get(key), "to": new.get(key)} for key in sorted(set(old) | set(new)) if old.get(key) != new.get(key)}
+    return {"from_version": from_version, "to_version": to_version, "changes": changes}
+
+# --- Compaction ---
+def compact(db: Session, owner_id: int) -> int:
+    """Keeps the newest HISTORY_MAX_VERSIONS versions. Returns how many were deleted."""
+    versions = [v for (v,) in db.query(Version.version).filter(Version.owner_id == owner_id).order_by(Version.version.desc()).all()]
+    if len(versions) <= HISTORY_MAX_VERSIONS:
+        return 0
+    oldest_kept = versions[HISTORY_MAX_VERSIONS - 1]
+    row = db.query(Version).filter(Version.owner_id == owner_id, Version.version == oldest_kept).first()
+    if row.kind == DELTA:
+        data = get_version(db, owner_id, oldest_kept)
+        if data is None:
+            # Its chain is already broken, so it can't be rebuilt later either.
+            oldest_kept += 1
+        else:
+            row.kind, row.data = SNAPSHOT, _pack(data)
+    deleted = (
+        db.query(Version)
+        .filter(Version.owner_id == owner_id, Version.version < oldest_kept)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
+
+def compact_all() -> int:
+    db = database.SessionLocal()
+    try:
+        owners = [owner_id for (owner_id,) in db.query(Version.owner_id).distinct().all()]
+        return sum(compact(db, owner_id) for owner_id in owners)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain stored resume version history.")
+    parser.add_argument("--compact", action="store_true", help="trim every user's history to RESUME_HISTORY_MAX_VERSIONS")
+    args = parser.parse_args()
+    if args.compact:
+        database.init_db()
+        print(f"Deleted {compact_all()} old resume versions.")
+    else:
+        parser.print_help()
@@ -0,0 +1,147 @@
+"""
+Migrates stored resumes to the configured storage format and indexes them by owner.
+
+    python -m backend.resume_storage --stats
+    python -m backend.resume_storage --migrate [--format gzip] [--batch-size 1000]
+
+--migrate is safe to re-run and to run while the API is serving:
+  1. Adds the resume_blob column if it is missing.
+  2. Removes duplicate resumes per user, keeping the newest version.
+  3. Creates the unique index on resumes.owner_id.
+  4. On PostgreSQL, converts resume_data from json to jsonb.
+  5. Rewrites rows whose storage differs from the target format, in id-ordered batches.
+     Only one batch is in memory at a time. Each row is updated only if its version is
+     unchanged, so a concurrent save is never overwritten. Versions are not bumped, since
+     the content is unchanged, so ETags stay valid.
+"""
+import json
+import time
+import argparse
+from sqlalchemy import Text, and_, bindparam, cast, func, inspect, select, text
+from . import database
+
+resumes = database.Resume.__table__
+
+def _stored_size(resume_json, resume_blob) -> int:
+    if resume_blob is not None:
+        return len(resume_blob)
+    return len(resume_json if isinstance(resume_json, str) else json.dumps(resume_json, separators=(",", ":")))
+
+def _stored_format(resume_json, resume_blob) -> str:
+    if resume_blob is None:
+        return "json" if resume_json is None or isinstance(resume_json, dict) else "json-text"
+    return "zstd" if resume_blob[:4] == database.ZSTD_MAGIC else "gzip"
+
+# --- Stats ---
+def storage_stats() -> dict:
+    """Row counts and stored bytes for each storage form."""
+    with database.engine.connect() as conn:
+        blob_rows, blob_bytes = conn.execute(
+            select(func.count(), func.coalesce(func.sum(func.length(resumes.c.resume_blob)), 0)).where(resumes.c.resume_blob.is_not(None))
+        ).one()
+        json_rows, json_bytes = conn.execute(
+            select(func.count(), func.coalesce(func.sum(func.length(cast(resumes.c.resume_data, Text))), 0)).where(resumes.c.resume_data.is_not(None))
+        ).one()
+        duplicates = conn.execute(
+            select(func.count()).select_from(select(resumes.c.owner_id).group_by(resumes.c.owner_id).having(func.count() > 1).subquery())
+        ).scalar()
+    return {
+        "json_rows": json_rows, "json_bytes": json_bytes,
+        "compressed_rows": blob_rows, "compressed_bytes": blob_bytes,
+        "owners_with_duplicates": duplicates,
+    }
+
+# --- Migration Steps ---
+def remove_duplicates() -> int:
+    """Keeps one resume per user (highest version, then highest id). Returns how many rows were deleted."""
+    deleted = 0
+    with database.engine.begin() as conn:
+        owners = conn.execute(select(resumes.c.owner_id).group_by(resumes.c.owner_id).having(func.count() > 1)).scalars().all()
+        for owner_id in owners:
+            ids = conn.execute(
+                select(resumes.c.id).where(resumes.c.owner_id == owner_id).order_by(resumes.c.version.desc(), resumes.c.id.desc())
+            ).scalars().all()
+            deleted += conn.execute(resumes.delete().where(resumes.c.id.in_(ids[1:]))).rowcount
+    return deleted
+
+def add_owner_index():
+    with database.engine.begin() as conn:
+        conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_resumes_owner_id ON resumes (owner_id)"))
+
+def convert_to_jsonb() -> bool:
+    """Changes resume_data to jsonb on PostgreSQL. Returns whether the column was converted."""
+    if database.engine.dialect.name != "postgresql":
+        return False
+    column = next(column for column in inspect(database.engine).get_columns("resumes") if column["name"] == "resume_data")
+    if type(column["type"]).__name__.upper() == "JSONB":
+        return False
+    with database.engine.begin() as conn:
+        conn.execute(text("ALTER TABLE resumes ALTER COLUMN resume_data TYPE jsonb USING resume_data::jsonb"))
+    return True
+
+def convert_rows(target: str, batch_size: int = 1000) -> dict:
+    """Rewrites every row not already stored as `target`, one batch of ids at a time."""
+    update = (
+        resumes.update()
+        .where(and_(resumes.c.id == bindparam("row_id"), resumes.c.version == bindparam("row_version")))
+        .values(resume_data=bindparam("new_json"), resume_blob=bindparam("new_blob"))
+    )
+    report = {"scanned": 0, "converted": 0, "skipped_concurrent": 0, "bytes_before": 0, "bytes_after": 0}
+    started = time.perf_counter()
+    last_id = 0
+    while True:
+        with database.engine.begin() as conn:
+            rows = conn.execute(
+                select(resumes.c.id, resumes.c.version, resumes.c.resume_data, resumes.c.resume_blob)
+                .where(resumes.c.id > last_id)
+                .order_by(resumes.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            report["scanned"] += len(rows)
+            params = []
+            for row in rows:
+                if _stored_format(row.resume_data, row.resume_blob) == target or (row.resume_data is None and row.resume_blob is None):
+                    continue
+                data = database.load_resume(row.resume_data, row.resume_blob)
+                new_blob = None if target == "json" else database.encode_resume(data, target)
+                params.append({"row_id": row.id, "row_version": row.version, "new_json": data if target == "json" else None, "new_blob": new_blob})
+                report["bytes_before"] += _stored_size(row.resume_data, row.resume_blob)
+                report["bytes_after"] += _stored_size(data if new_blob is None else None, new_blob)
+            if params:
+                updated = conn.execute(update, params).rowcount
+                # Some DBAPIs report -1 for executemany; treat that as all updated.
+                updated = len(params) if updated is None or updated < 0 else updated
+                report["converted"] += updated
+                report["skipped_concurrent"] += len(params) - updated
+        if report["scanned"] % (batch_size * 20) == 0:
+            print(f"  scanned {report['scanned']} rows, converted {report['converted']}")
+    report["seconds"] = round(time.perf_counter() - started, 2)
+    return report
+
+def migrate(target: str, batch_size: int = 1000) -> dict:
+    database.init_db()
+    removed = remove_duplicates()
+    print(f"Removed {removed} duplicate resumes.")
+    add_owner_index()
+    print("Unique index on resumes.owner_id is in place.")
+    if convert_to_jsonb():
+        print("Converted resumes.resume_data to jsonb.")
+    print(f"Converting rows to '{target}' in batches of {batch_size}...")
+    return convert_rows(target, batch_size)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate stored resumes between storage formats.")
+    parser.add_argument("--migrate", action="store_true", help="dedupe, index and convert every row to --format")
+    parser.add_argument("--stats", action="store_true", help="show row counts and stored bytes per storage form")
+    parser.add_argument("--format", choices=["json", "gzip", "zstd"], default=database.RESUME_STORAGE_FORMAT)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    if args.format == "zstd" and database.zstandard is None:
+        parser.error("--format zstd needs the 'zstandard' package")
+    if args.migrate:
+        print(migrate(args.format, args.batch_size))
+    if args.stats or not args.migrate:
+        print(storage_stats())
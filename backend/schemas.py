@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
+from datetime import datetime
 
 # --- Resume Data Schemas ---
 # These define the structure for a user's resume data. They are the "source of truth"
@@ -49,6 +50,39 @@ class ResumeData(BaseModel):
         # Use 'from_attributes' for Pydantic V2 compatibility instead of 'orm_mode'
         from_attributes = True
 
+class ResumePatch(BaseModel):
+    """Section-level update: only the fields present in the request are validated and replaced."""
+    name: Optional[str] = None
+    email: Optional[EmailStr] = None
+    phone: Optional[str] = None
+    linkedin: Optional[str] = None
+    github: Optional[str] = None
+    leetcode: Optional[str] = None
+    summary: Optional[str] = None
+    education: Optional[List[Education]] = None
+    projects: Optional[List[Project]] = None
+    internships: Optional[List[Experience]] = None
+    experience: Optional[List[Experience]] = None
+    skills: Optional[List[SkillCategory]] = None
+    achievements: Optional[List[str]] = None
+    leadership: Optional[List[str]] = None
+    section_order: Optional[List[str]] = None
+
+class ResumePatchResult(BaseModel):
+    updated: List[str]
+    version: int
+
+class ResumeVersionInfo(BaseModel):
+    version: int
+    kind: str
+    created_at: Optional[datetime] = None
+    stored_bytes: int
+
+class ResumeVersionDiff(BaseModel):
+    from_version: int
+    to_version: int
+    changes: Dict[str, Dict[str, Any]]
+
 # --- User Authentication Schemas ---
 # These define the data needed for creating users and handling login tokens.
 
@@ -78,3 +112,35 @@ class SummaryRequest(BaseModel):
     skills: List[SkillCategory]
     job_description: str
 
+
+# --- Background Job Schemas ---
+class JobStatus(BaseModel):
+    job_id: str
+    status: str
+    result: Optional[ResumeData] = None
+    error: Optional[str] = None
+
+# --- Batch Export Schemas ---
+class BatchExportRequest(BaseModel):
+    user_ids: List[int] = []
+    resumes: List[ResumeData] = []
+
+# --- Bulk Import/Export Schemas ---
+class BulkUserRecord(BaseModel):
+    """One NDJSON line of a bulk import. Give either password or hashed_password (bcrypt, e.g. from an export)."""
+    email: EmailStr
+    password: Optional[str] = None
+    hashed_password: Optional[str] = None
+    resume: Optional[ResumeData] = None
+
+class BulkImportError(BaseModel):
+    line: int
+    error: str
+
+class BulkImportResult(BaseModel):
+    received: int
+    created: int
+    failed: int
+    elapsed_seconds: float
+    records_per_second: Optional[float] = None
+    errors: List[BulkImportError]
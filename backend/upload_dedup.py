@@ -0,0 +1,122 @@
+"""
+Skips re-parsing resumes that have been parsed before.
+
+Each complete parse is stored in parsed_uploads under two hashes:
+    pdf_hash   SHA-256 of the uploaded bytes, matched per user: an identical re-upload skips
+               text extraction and the LLM entirely
+    text_hash  SHA-256 of the extracted text, matched per user and, when PARSE_DEDUP_GLOBAL
+               is on, across users: a re-exported PDF with the same content still hits
+
+Entries untouched for PARSE_DEDUP_TTL_DAYS are evicted, and each user keeps at most
+PARSE_DEDUP_MAX_PER_USER entries (least recently used go first).
+"""
+import os
+import asyncio
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from . import database, ai_utils, pdf_text
+
+# --- Configuration ---
+PARSE_DEDUP_ENABLED = os.getenv("PARSE_DEDUP_ENABLED", "1") != "0"
+PARSE_DEDUP_GLOBAL = os.getenv("PARSE_DEDUP_GLOBAL", "0") == "1"
+PARSE_DEDUP_TTL_DAYS = int(os.getenv("PARSE_DEDUP_TTL_DAYS", "30"))
+PARSE_DEDUP_MAX_PER_USER = int(os.getenv("PARSE_DEDUP_MAX_PER_USER", "5"))
+
+def _now():
+    return datetime.now(timezone.utc)
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+# --- Storage ---
+def _touch_and_return(db, entry):
+    entry.last_used_at = _now()
+    db.commit()
+    return entry.result
+
+def find_by_pdf(owner_id: int, pdf_hash: str) -> Optional[dict]:
+    db = database.SessionLocal()
+    try:
+        entry = db.query(database.ParsedUpload).filter(
+            database.ParsedUpload.owner_id == owner_id,
+            database.ParsedUpload.pdf_hash == pdf_hash,
+        ).first()
+        return _touch_and_return(db, entry) if entry else None
+    finally:
+        db.close()
+
+def find_by_text(owner_id: int, text_hash: str) -> Optional[dict]:
+    db = database.SessionLocal()
+    try:
+        query = db.query(database.ParsedUpload).filter(database.ParsedUpload.text_hash == text_hash)
+        entry = query.filter(database.ParsedUpload.owner_id == owner_id).first()
+        if entry is None and PARSE_DEDUP_GLOBAL:
+            entry = query.order_by(database.ParsedUpload.last_used_at.desc()).first()
+        return _touch_and_return(db, entry) if entry else None
+    finally:
+        db.close()
+
+def store(owner_id: int, pdf_hash: str, text_hash: str, result: dict):
+    db = database.SessionLocal()
+    try:
+        now = _now()
+        db.query(database.ParsedUpload).filter(
+            database.ParsedUpload.owner_id == owner_id,
+            database.ParsedUpload.pdf_hash == pdf_hash,
+        ).delete(synchronize_session=False)
+        db.add(database.ParsedUpload(owner_id=owner_id, pdf_hash=pdf_hash, text_hash=text_hash, result=result, created_at=now, last_used_at=now))
+        db.commit()
+        evict(db, owner_id)
+    finally:
+        db.close()
+
+def evict(db, owner_id: int):
+    """Drops expired entries and trims the user's entries to the per-user cap."""
+    db.query(database.ParsedUpload).filter(
+        database.ParsedUpload.last_used_at < _now() - timedelta(days=PARSE_DEDUP_TTL_DAYS)
+    ).delete(synchronize_session=False)
+    keep = (
+        db.query(database.ParsedUpload.id)
+        .filter(database.ParsedUpload.owner_id == owner_id)
+        .order_by(database.ParsedUpload.last_used_at.desc())
+        .limit(PARSE_DEDUP_MAX_PER_USER)
+        .subquery()
+    )
+    db.query(database.ParsedUpload).filter(
+        database.ParsedUpload.owner_id == owner_id,
+        database.ParsedUpload.id.notin_(db.query(keep.c.id)),
+    ).delete(synchronize_session=False)
+    db.commit()
+
+# --- Parsing ---
+async def aparse_resume(owner_id: int, pdf_bytes: bytes, force_refresh: bool = False):
+    """Parses an uploaded resume, reusing a stored result for repeat uploads unless force_refresh is set."""
+    if not PARSE_DEDUP_ENABLED:
+        return await ai_utils.aparse_resume_from_pdf(pdf_bytes)
+
+    pdf_hash = content_hash(pdf_bytes)
+    if not force_refresh:
+        stored = await asyncio.to_thread(find_by_pdf, owner_id, pdf_hash)
+        if stored is not None:
+            return stored
+
+    try:
+        resume_text = await asyncio.to_thread(pdf_text.extract_text, pdf_bytes)
+    except Exception as e:
+        print(f"Error extracting resume text: {e}")
+        return {"error": f"Failed to parse resume: {e}"}
+
+    # Scanned/empty PDFs all hash the same, so never share results for them.
+    text_hash = content_hash(resume_text.encode("utf-8")) if resume_text.strip() else None
+    if text_hash and not force_refresh:
+        stored = await asyncio.to_thread(find_by_text, owner_id, text_hash)
+        if stored is not None:
+            await asyncio.to_thread(store, owner_id, pdf_hash, text_hash, stored)
+            return stored
+
+    parsed, complete = await ai_utils.aparse_resume_text_with_status(resume_text, refresh=force_refresh)
+    # Degraded results (skills timed out or failed) are returned but not stored, so the next upload retries.
+    if complete:
+        await asyncio.to_thread(store, owner_id, pdf_hash, text_hash, parsed)
+    return parsed
@@ -0,0 +1,86 @@
+"""
+Per-request overhead of authentication on GET /resume/, measured in-process with FastAPI's
+TestClient against a throwaway SQLite database.
+
+Four configurations are compared, each for a full read (200) and a conditional one (304):
+    baseline, two queries   the handler before the auth cache: user by email, then the resume
+    email token, no cache   tokens issued before user ids were added; user matched by email
+    id token, no cache      user matched by primary key, joined with the resume in one query
+    id token, cached        principal served from the auth cache, one resume query
+
+The baseline is served by a copy of the old handler registered under /bench/resume/.
+
+Run from the repository root:
+    python -m benchmarks.bench_auth_overhead --requests 2000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tmp, 'bench_auth.db')}")
+    os.environ.setdefault("AI_BACKEND", "fake")
+    os.environ.setdefault("PARSE_JOB_WORKERS", "0")
+    os.environ["LLM_CACHE_DB_PATH"] = ""
+
+    from fastapi import Depends, Header, Response
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+    from backend import auth, database, schemas, main as api
+
+    queries = [0]
+    event.listen(database.engine, "before_cursor_execute", lambda *a, **k: queries.__setitem__(0, queries[0] + 1))
+
+    @api.app.get("/bench/resume/", response_model=schemas.ResumeData)
+    def baseline_get_resume(response: Response, if_none_match: str = Header(None), token: str = Depends(auth.oauth2_scheme), db: Session = Depends(database.get_db)):
+        # GET /resume/ before principals were cached: one query for the user, one for the version.
+        current_user = auth.get_user_by_email(db, email=auth._decode_token(token)["sub"])
+        row = db.query(database.Resume.version).filter(database.Resume.owner_id == current_user.id).first()
+        etag = api._resume_etag(row.version if row else 0)
+        if api._etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return db.query(database.Resume).filter(database.Resume.owner_id == current_user.id).first().resume_data
+
+    database.init_db()
+    client = TestClient(api.app)
+    client.post("/signup", json={"email": "bench@example.com", "password": "bench-password"})
+    token = client.post("/token", data={"username": "bench@example.com", "password": "bench-password"}).json()["access_token"]
+    saved = client.put("/resume/", json={"name": "Bench", "email": "bench@example.com", "summary": "x" * 2000}, headers={"Authorization": f"Bearer {token}"})
+    assert saved.status_code == 200, f"setup PUT /resume/ failed: {saved.status_code} {saved.text}"
+    email_token = auth.create_access_token(data={"sub": "bench@example.com"})
+
+    etag = saved.headers["ETag"]
+    cache_ttl = auth.AUTH_CACHE_TTL_SECONDS
+    print(f"{'configuration':<24}{'status':>7}{'mean us':>10}{'p99 us':>10}{'queries/req':>13}")
+    for label, path, bearer, ttl in (
+        ("baseline, two queries", "/bench/resume/", email_token, 0),
+        ("email token, no cache", "/resume/", email_token, 0),
+        ("id token, no cache", "/resume/", token, 0),
+        ("id token, cached", "/resume/", token, cache_ttl or 30),
+    ):
+        auth.AUTH_CACHE_TTL_SECONDS = ttl
+        for expected, extra in ((200, {}), (304, {"If-None-Match": etag})):
+            headers = {"Authorization": f"Bearer {bearer}", **extra}
+            warmup = client.get(path, headers=headers)
+            assert warmup.status_code == expected, f"GET {path} returned {warmup.status_code} for '{label}'"
+            samples = []
+            queries[0] = 0
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                client.get(path, headers=headers)
+                samples.append((time.perf_counter() - started) * 1e6)
+            samples.sort()
+            p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+            print(f"{label:<24}{expected:>7}{statistics.mean(samples):>10.0f}{p99:>10.0f}{queries[0] / args.requests:>13.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Bulk NDJSON import and export throughput against a throwaway SQLite database.
+
+Generates --records users with synthetic resumes, imports them with backend.bulk, then exports
+everything again. Reports records/s for both directions and the process's peak RSS, which
+should stay flat as --records grows. Run from the repository root:
+
+    python -m benchmarks.bench_bulk_import --records 100000 --bcrypt-rounds 4
+
+Hashing dominates at the default cost, so compare --bcrypt-rounds 4 with 12 at a smaller --records.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import tempfile
+import time
+
+from benchmarks.bench_resume_storage import synthetic_resume
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--bcrypt-rounds", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench_bulk.db')}"
+    os.environ["BULK_IMPORT_WORKERS"] = str(args.workers)
+    from backend import bulk, database
+    database.init_db()
+
+    source = os.path.join(tmp, "users.ndjson")
+    rng = random.Random(7)
+    with open(source, "w", encoding="utf-8") as f:
+        for i in range(args.records):
+            f.write(json.dumps({"email": f"bulk{i}@example.com", "password": f"password-{i}", "resume": synthetic_resume(rng, i)}) + "\n")
+    print(f"Generated {args.records} records ({os.path.getsize(source) / 1e6:.1f} MB)")
+
+    with open(source, "rb") as f:
+        summary = bulk.import_file(f, args.bcrypt_rounds)
+    print(f"import: {summary['created']} created, {summary['failed']} failed in {summary['elapsed_seconds']}s "
+          f"({summary['records_per_second']} records/s, bcrypt rounds {args.bcrypt_rounds}, {args.workers} workers)")
+    if summary["failed"]:
+        # A rejected record skews records/s, so the numbers are not worth reporting.
+        for error in summary["errors"][:5]:
+            print(f"  line {error['line']}: {error['error']}")
+        raise SystemExit(f"{summary['failed']} records failed to import; fix the generator before reading these numbers.")
+
+    started = time.perf_counter()
+    exported = 0
+    with open(os.devnull, "wb") as out:
+        for chunk in bulk.iter_export(include_password_hashes=True):
+            exported += chunk.count(b"\n")
+            out.write(chunk)
+    elapsed = time.perf_counter() - started
+    print(f"export: {exported} records in {elapsed:.2f}s ({exported / elapsed:.0f} records/s)")
+    # ru_maxrss is in KiB on Linux.
+    print(f"peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+if __name__ == "__main__":
+    main()
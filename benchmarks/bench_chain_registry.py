@@ -0,0 +1,70 @@
+"""
+Per-call overhead of building LLM chains on every request vs. reusing them from ChainRegistry.
+
+The model call itself is stubbed with a canned response, so the numbers only cover client
+construction, format-instruction generation, prompt rendering and output parsing.
+
+Run from the repository root:
+    python -m benchmarks.bench_chain_registry --iterations 500
+"""
+import argparse
+import json
+import statistics
+import time
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from backend import ai_utils
+
+DUMMY_API_KEY = "benchmark-key"
+CANNED_RESPONSE = json.dumps({"skills": [{"category": "Languages", "details": "Python, Java"}]})
+PARAMS = {"skills": "python, java, react, fastapi, docker"}
+
+def stub_llm(api_key, temperature):
+    return FakeListChatModel(responses=[CANNED_RESPONSE])
+
+def per_request_call():
+    """The old behaviour: a fresh Gemini client, parser and prompt for every call."""
+    ChatGoogleGenerativeAI(model=ai_utils.GEMINI_MODEL, google_api_key=DUMMY_API_KEY, temperature=0.0)
+    prompt, parser = ai_utils._categorize_skills_prompt()
+    chain = prompt | stub_llm(DUMMY_API_KEY, 0.0) | parser
+    return chain.invoke(PARAMS)
+
+def make_registry_call():
+    registry = ai_utils.ChainRegistry(ai_utils.TASKS, llm_factory=stub_llm)
+    registry.warm(DUMMY_API_KEY)
+
+    def registry_call():
+        return registry.get("categorize_skills", DUMMY_API_KEY).chain.invoke(PARAMS)
+    return registry_call
+
+def measure(fn, iterations):
+    fn()  # warm-up
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return {
+        "mean_us": statistics.mean(samples),
+        "p50_us": samples[len(samples) // 2],
+        "p95_us": samples[int(len(samples) * 0.95) - 1],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    before = measure(per_request_call, args.iterations)
+    after = measure(make_registry_call(), args.iterations)
+
+    print(f"{'':<22}{'mean':>12}{'p50':>12}{'p95':>12}")
+    for label, result in (("per-request (before)", before), ("registry (after)", after)):
+        print(f"{label:<22}{result['mean_us']:>10.1f}us{result['p50_us']:>10.1f}us{result['p95_us']:>10.1f}us")
+    print(f"speedup (mean): {before['mean_us'] / after['mean_us']:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Per-call cost of the LLM response cache's persistent (SQLite) tier.
+
+Fills a throwaway cache file with --entries responses, then times set() of new keys and get()
+of random existing keys. Every get is a hit. No LLM is involved. Run from the repository root:
+
+    python -m benchmarks.bench_llm_cache --iterations 2000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from backend import llm_cache
+
+VALUE = json.dumps({"skills": [{"category": "Languages", "details": "Python, Java, SQL"}] * 8})
+
+def summarize(samples):
+    samples.sort()
+    return {
+        "mean_us": statistics.mean(samples),
+        "p50_us": samples[len(samples) // 2],
+        "p95_us": samples[int(len(samples) * 0.95) - 1],
+    }
+
+def timed(fn, args_list):
+    samples = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - started) * 1e6)
+    return summarize(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tier = llm_cache.SQLiteTier(os.path.join(tmp, "llm_cache.db"), args.entries + args.iterations, 3600)
+        keys = [f"key-{i}" for i in range(args.entries)]
+        for key in keys:
+            tier.set(key, VALUE)
+
+        rng = random.Random(7)
+        results = {
+            "set": timed(tier.set, [(f"new-{i}", VALUE) for i in range(args.iterations)]),
+            "get (hit)": timed(tier.get, [(rng.choice(keys),) for _ in range(args.iterations)]),
+        }
+
+    print(f"{'operation':<12}{'mean µs':>10}{'p50 µs':>10}{'p95 µs':>10}")
+    for name, stats in results.items():
+        print(f"{name:<12}{stats['mean_us']:>10.1f}{stats['p50_us']:>10.1f}{stats['p95_us']:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Login throughput under mixed load.
+
+Login threads log in repeatedly with valid credentials while reader threads poll GET /resume/.
+The benchmark reports logins/s with p50/p99 login latency, and the /resume/ latency alongside,
+which shows whether bcrypt work starves other traffic. Start the backend first, e.g.
+
+    LOGIN_MAX_FAILURES_PER_IP=1000000 uvicorn backend.main:app --workers 2
+
+    python -m benchmarks.bench_login --login-threads 16 --reader-threads 16 --duration 30
+
+Run it with different PASSWORD_HASH_WORKERS and BCRYPT_ROUNDS settings on the server to compare.
+"""
+import argparse
+import os
+import threading
+import time
+import uuid
+
+import requests
+
+from benchmarks.load_test import Recorder, percentile
+
+PASSWORD = "bench-login-password"
+
+def create_account(base_url):
+    email = f"login-{uuid.uuid4().hex[:12]}@example.com"
+    requests.post(f"{base_url}/signup", json={"email": email, "password": PASSWORD}, timeout=60)
+    token = requests.post(f"{base_url}/token", data={"username": email, "password": PASSWORD}, timeout=60).json()["access_token"]
+    return email, token
+
+def timed(recorder, name, fn):
+    started = time.perf_counter()
+    ok = False
+    try:
+        ok = fn().status_code < 400
+    except requests.RequestException:
+        pass
+    recorder.record(name, time.perf_counter() - started, ok)
+
+def login_loop(base_url, email, recorder, stop):
+    session = requests.Session()
+    while not stop.is_set():
+        timed(recorder, "POST /token", lambda: session.post(f"{base_url}/token", data={"username": email, "password": PASSWORD}, timeout=60))
+
+def reader_loop(base_url, token, recorder, stop):
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {token}"
+    while not stop.is_set():
+        timed(recorder, "GET /resume/", lambda: session.get(f"{base_url}/resume/", timeout=60))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=os.getenv("BACKEND_URL", "http://127.0.0.1:8000"))
+    parser.add_argument("--login-threads", type=int, default=8)
+    parser.add_argument("--reader-threads", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds")
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip("/")
+    accounts = [create_account(base_url) for _ in range(max(args.login_threads, args.reader_threads))]
+    recorder = Recorder()
+    stop = threading.Event()
+    threads = [threading.Thread(target=login_loop, args=(base_url, accounts[i][0], recorder, stop)) for i in range(args.login_threads)]
+    threads += [threading.Thread(target=reader_loop, args=(base_url, accounts[i][1], recorder, stop)) for i in range(args.reader_threads)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    print(f"{'endpoint':<16}{'count':>8}{'errors':>8}{'per s':>9}{'p50 ms':>10}{'p99 ms':>10}")
+    for name in ("POST /token", "GET /resume/"):
+        values = sorted(recorder.samples[name])
+        print(f"{name:<16}{len(values):>8}{recorder.errors[name]:>8}{len(values) / args.duration:>9.1f}"
+              f"{percentile(values, 50) * 1000:>10.1f}{percentile(values, 99) * 1000:>10.1f}")
+
+if __name__ == "__main__":
+    main()
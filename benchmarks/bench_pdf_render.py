@@ -0,0 +1,93 @@
+"""
+Resume PDF renders per second with per-render setup (the old behaviour: fonts re-registered
+and styles rebuilt on every call) vs. the shared font and style registry.
+
+Run from the repository root:
+    python -m benchmarks.bench_pdf_render --renders 200 --threads 4
+
+With fonts missing both runs fall back to Times, and only the style setup is measured.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# The frontend modules import each other relative to frontend/, as they do under Streamlit.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "frontend"))
+
+from modules import resume_generator  # noqa: E402
+from templates import template1  # noqa: E402
+
+SAMPLE_RESUME = {
+    "name": "Benchmark Candidate",
+    "email": "candidate@example.com",
+    "phone": "+91 90000 00000",
+    "linkedin": "https://linkedin.com/in/candidate",
+    "github": "https://github.com/candidate",
+    "summary": "Backend engineer with three years of experience building Python services, data pipelines "
+               "and developer tooling. Comfortable owning features from design through production.",
+    "education": [
+        {"degree": "B.E. in Computer Science", "institution": "Example Institute of Technology", "dates": "2019 - 2023", "grade_type": "CGPA", "grade_value": "8.9"},
+        {"degree": "Higher Secondary", "institution": "Example PU College", "dates": "2017 - 2019", "grade_type": "Percentage", "grade_value": "94%"},
+    ],
+    "experience": [
+        {"role": "Software Engineer", "company": "Example Corp", "dates": "2023 - Present",
+         "responsibilities": [f"Shipped improvement {i} to the billing service, cutting p95 latency by {10 + i}%." for i in range(4)]},
+    ],
+    "internships": [
+        {"role": "Backend Intern", "company": "Startup Labs", "dates": "Summer 2022",
+         "responsibilities": ["Built an internal admin API with FastAPI.", "Wrote integration tests for the payments flow."]},
+    ],
+    "projects": [
+        {"title": f"Project {i}: A service that does useful thing {i}", "techStack": "Python, FastAPI, PostgreSQL, Docker",
+         "repo_link": f"https://github.com/candidate/project-{i}",
+         "points": [f"Designed and built component {j} handling thousands of requests per second." for j in range(3)]}
+        for i in range(4)
+    ],
+    "skills": [
+        {"category": "Languages", "details": "Python, Java, SQL, TypeScript"},
+        {"category": "Frameworks", "details": "FastAPI, Django, React"},
+        {"category": "Tools", "details": "Docker, Git, PostgreSQL, Redis"},
+    ],
+    "achievements": ["Winner, Example Hackathon 2022", "Top 5% in national coding contest"],
+    "leadership": ["Lead, college coding club", "Organised a 300-person hackathon"],
+}
+
+def reset_registry():
+    """Forgets the registered fonts, built styles and cached paragraph parses, so the next render pays the setup again."""
+    resume_generator._fonts_registered = None
+    template1._style_cache.clear()
+    template1.clear_paragraph_cache()
+
+def run(renders, threads, cold):
+    def render(_):
+        if cold:
+            reset_registry()
+        return len(resume_generator.render_pdf(SAMPLE_RESUME))
+
+    render(0)  # warm-up: imports, first font parse
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        sizes = list(pool.map(render, range(renders)))
+    elapsed = time.perf_counter() - started
+    return renders / elapsed, sizes[0]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    # The cold run resets shared state before every render, so it is always single-threaded.
+    cold_rate, size = run(args.renders, 1, cold=True)
+    print(f"per-render setup:  {cold_rate:8.1f} renders/s  ({size} bytes)")
+    warm_rate, size = run(args.renders, 1, cold=False)
+    print(f"shared registry:   {warm_rate:8.1f} renders/s  ({size} bytes)")
+    print(f"speed-up:          {warm_rate / cold_rate:8.2f}x")
+    if args.threads > 1:
+        threaded_rate, _ = run(args.renders, args.threads, cold=False)
+        print(f"shared, {args.threads} threads: {threaded_rate:8.1f} renders/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Re-render latency after a single-field edit on a large resume, with the paragraph cache
+cold (every paragraph parsed, the old behaviour) vs. warm (only the edited paragraph parsed).
+Flowables are created fresh on every build either way.
+
+Both the story build (template only) and the full render (story + ReportLab layout) are timed.
+
+Run from the repository root:
+    python -m benchmarks.bench_pdf_rerender --projects 30 --jobs 10 --repeat 30
+"""
+import argparse
+import copy
+import statistics
+import time
+
+from benchmarks.bench_pdf_render import SAMPLE_RESUME, resume_generator, template1
+
+def large_resume(projects, jobs):
+    data = copy.deepcopy(SAMPLE_RESUME)
+    data["projects"] = [
+        {"title": f"Project {i}: Something substantial number {i}", "techStack": "Python, FastAPI, PostgreSQL, Redis, Docker",
+         "repo_link": f"https://github.com/candidate/project-{i}",
+         "points": [f"Built part {j} of project {i}, serving <b>thousands</b> of users with sub-100ms latency." for j in range(4)]}
+        for i in range(projects)
+    ]
+    data["experience"] = [
+        {"role": f"Engineer {i}", "company": f"Company {i}", "dates": f"{2010 + i} - {2011 + i}",
+         "responsibilities": [f"Owned workstream {j}, shipping on time and under budget." for j in range(4)]}
+        for i in range(jobs)
+    ]
+    return data
+
+def edit(data, n):
+    """A single-field edit: one bullet of the first project."""
+    data["projects"][0]["points"][0] = f"Built part 0 of project 0 (revision {n})."
+
+def time_ms(fn, repeat, data):
+    """Median cold and warm latency. The samples alternate, so machine noise hits both alike."""
+    cold, warm = [], []
+    for n in range(repeat):
+        for samples in (cold, warm):
+            if samples is cold:
+                template1.clear_paragraph_cache()
+            edit(data, n)
+            started = time.perf_counter()
+            fn(data)
+            samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(cold), statistics.median(warm)
+
+def build_story(data):
+    story = []
+    template1.create_pradyumna_style_template(story, data, use_custom_font=resume_generator.register_fonts())
+    return story
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=30)
+    parser.add_argument("--jobs", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    data = large_resume(args.projects, args.jobs)
+    print(f"resume: {args.projects} projects, {args.jobs} jobs, {len(resume_generator.render_pdf(data))} bytes")
+    print(f"{'':<16}{'cold ms':>10}{'warm ms':>10}{'speed-up':>10}")
+    for label, fn in (("story build", build_story), ("full render", resume_generator.render_pdf)):
+        cold, warm = time_ms(fn, args.repeat, data)
+        print(f"{label:<16}{cold:>10.2f}{warm:>10.2f}{cold / warm:>9.2f}x")
+
+if __name__ == "__main__":
+    main()
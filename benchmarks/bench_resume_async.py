@@ -0,0 +1,108 @@
+"""
+GET /resume/ throughput and tail latency, sync vs async database path, under many concurrent clients.
+
+For each mode the benchmark starts its own uvicorn server (DB_ASYNC=0, then DB_ASYNC=1) against a
+fresh database, creates accounts with stored resumes, then runs --clients threads that poll
+GET /resume/ for --duration seconds. It reports req/s with p50/p99 latency for each mode:
+
+    python -m benchmarks.bench_resume_async --clients 500 --duration 30
+
+Pass --database-url to benchmark against PostgreSQL instead of a throwaway SQLite file; every
+server in the run uses that database. The client side is thread-based, so run it on a machine
+(or cores) separate from the server when measuring beyond a few thousand req/s.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import requests
+
+from benchmarks.load_test import Recorder, SAMPLE_RESUME, percentile
+
+PASSWORD = "bench-resume-password"
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+def start_server(port, database_url, db_async, workers):
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "DB_ASYNC": "1" if db_async else "0",
+        "AI_BACKEND": "fake",
+        "PARSE_JOB_WORKERS": "0",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"{base_url}/docs", timeout=1)
+            return server, base_url
+        except requests.RequestException:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("server did not start")
+
+def create_account(base_url):
+    email = f"resume-{uuid.uuid4().hex[:12]}@example.com"
+    requests.post(f"{base_url}/signup", json={"email": email, "password": PASSWORD}, timeout=60)
+    token = requests.post(f"{base_url}/token", data={"username": email, "password": PASSWORD}, timeout=60).json()["access_token"]
+    requests.put(f"{base_url}/resume/", json=SAMPLE_RESUME, headers={"Authorization": f"Bearer {token}"}, timeout=60)
+    return token
+
+def reader_loop(base_url, token, recorder, stop):
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {token}"
+    while not stop.is_set():
+        started = time.perf_counter()
+        ok = False
+        try:
+            ok = session.get(f"{base_url}/resume/", timeout=60).status_code == 200
+        except requests.RequestException:
+            pass
+        recorder.record("GET /resume/", time.perf_counter() - started, ok)
+
+def run(base_url, clients, accounts, duration):
+    tokens = [create_account(base_url) for _ in range(accounts)]
+    recorder = Recorder()
+    stop = threading.Event()
+    threads = [threading.Thread(target=reader_loop, args=(base_url, tokens[i % accounts], recorder, stop)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    values = sorted(recorder.samples["GET /resume/"])
+    return len(values) / duration, percentile(values, 50), percentile(values, 99), recorder.errors["GET /resume/"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--accounts", type=int, default=50, help="distinct users shared by the clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per mode")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers per server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--database-url", default="")
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for db_async in (False, True):
+        database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_resume.db')}"
+        server, base_url = start_server(args.port, database_url, db_async, args.workers)
+        try:
+            rate, p50, p99, errors = run(base_url, args.clients, args.accounts, args.duration)
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"{'async' if db_async else 'sync':<8}{rate:>10.1f}{p50 * 1000:>10.1f}{p99 * 1000:>10.1f}{errors:>8}")
+
+if __name__ == "__main__":
+    main()
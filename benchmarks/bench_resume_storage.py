@@ -0,0 +1,134 @@
+"""
+Storage size and read/write latency of the resume storage formats on a synthetic dataset.
+
+For each configuration a fresh SQLite database is filled with --users users and resumes. The
+benchmark then measures random owner lookups that decode the document (GET /resume/'s query),
+and random saves (PUT /resume/'s write):
+
+    json, no owner index   the original schema: JSON column, owner_id lookups scan the table
+    json                   JSON column, unique index on owner_id
+    gzip / zstd            compressed JSON in resume_blob, unique index on owner_id
+
+Run from the repository root, e.g. for the full dataset:
+    python -m benchmarks.bench_resume_storage --users 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+WORDS = (
+    "built designed led implemented scalable distributed python java react api service pipeline data "
+    "model latency throughput customers team platform cloud aws kubernetes docker sql postgres cache "
+    "reduced improved migrated automated monitoring testing deployment analytics dashboard mobile"
+).split()
+
+def synthetic_resume(rng: random.Random, user_id: int) -> dict:
+    def sentence(n):
+        return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+    return {
+        "name": f"User {user_id}",
+        "email": f"user{user_id}@example.com",
+        "phone": f"+1-555-{rng.randint(1000000, 9999999)}",
+        "summary": " ".join(sentence(rng.randint(8, 16)) for _ in range(3)),
+        "education": [{"degree": "B.Tech", "institution": f"Institute {rng.randint(1, 500)}", "dates": "2018 - 2022", "grade_type": "CGPA", "grade_value": f"{rng.uniform(6, 10):.2f}"}],
+        "experience": [
+            {"role": rng.choice(["Engineer", "Analyst", "Lead"]), "company": f"Company {rng.randint(1, 10000)}", "dates": "2022 - Present",
+             "responsibilities": [sentence(rng.randint(10, 20)) for _ in range(rng.randint(2, 5))]}
+            for _ in range(rng.randint(1, 4))
+        ],
+        "internships": [
+            {"role": "Intern", "company": f"Company {rng.randint(1, 10000)}", "dates": "Summer 2021",
+             "responsibilities": [sentence(rng.randint(8, 14)) for _ in range(rng.randint(1, 3))]}
+            for _ in range(rng.randint(0, 2))
+        ],
+        "projects": [
+            {"title": f"Project {rng.randint(1, 99999)}", "points": [sentence(rng.randint(10, 18)) for _ in range(rng.randint(2, 4))],
+             "techStack": ", ".join(rng.sample(WORDS, 4)), "repo_link": f"https://github.com/user{user_id}/p{rng.randint(1, 99)}"}
+            for _ in range(rng.randint(1, 4))
+        ],
+        "skills": [{"category": category, "details": ", ".join(rng.sample(WORDS, 6))} for category in ("Languages", "Frameworks", "Tools")],
+    }
+
+def measure(label, storage_format, owner_index, args):
+    from sqlalchemy import text
+    from sqlalchemy.orm import sessionmaker
+    from backend import database
+
+    path = os.path.join(tempfile.mkdtemp(), f"storage_{label.replace(' ', '_').replace(',', '')}.db")
+    engine = database.build_engine(f"sqlite:///{path}")
+    database.Base.metadata.create_all(bind=engine)
+    database.RESUME_STORAGE_FORMAT = storage_format
+    if not owner_index:
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_resumes_owner_id"))
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    for start in range(1, args.users + 1, args.batch_size):
+        ids = range(start, min(start + args.batch_size, args.users + 1))
+        resumes = []
+        for user_id in ids:
+            document = synthetic_resume(rng, user_id)
+            json_value, blob = (document, None) if storage_format == "json" else (None, database.encode_resume(document))
+            resumes.append({"owner_id": user_id, "resume_data": json_value, "resume_blob": blob, "version": 1})
+        with engine.begin() as conn:
+            conn.execute(database.User.__table__.insert(), [{"id": i, "email": f"user{i}@example.com", "hashed_password": "x"} for i in ids])
+            conn.execute(database.Resume.__table__.insert(), resumes)
+    load_seconds = time.perf_counter() - started
+    with engine.begin() as conn:
+        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+    size_mb = os.path.getsize(path) / 1e6
+
+    # Without the index every lookup scans the table, so fewer samples are taken.
+    samples = args.samples if owner_index else min(args.samples, 100)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    reads, writes = [], []
+    with Session() as db:
+        for _ in range(samples):
+            owner_id = rng.randint(1, args.users)
+            t0 = time.perf_counter()
+            db.query(database.Resume).filter(database.Resume.owner_id == owner_id).first().resume_data
+            reads.append(time.perf_counter() - t0)
+            db.expunge_all()
+        for _ in range(samples):
+            owner_id = rng.randint(1, args.users)
+            t0 = time.perf_counter()
+            db_resume = db.query(database.Resume).filter(database.Resume.owner_id == owner_id).first()
+            db_resume.resume_data = synthetic_resume(rng, owner_id)
+            db.commit()
+            writes.append(time.perf_counter() - t0)
+            db.expunge_all()
+    engine.dispose()
+
+    def pct(values, p):
+        values = sorted(values)
+        return values[min(len(values) - 1, int(len(values) * p / 100))] * 1000
+    print(f"{label:<24}{size_mb:>10.1f}{load_seconds:>9.1f}{statistics.median(reads) * 1000:>10.3f}{pct(reads, 99):>10.3f}"
+          f"{statistics.median(writes) * 1000:>10.3f}{pct(writes, 99):>10.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--samples", type=int, default=2000, help="random reads and writes per configuration")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    from backend import database, schemas
+    # Fail early if the generator drifts from the API schema; the sizes would be meaningless.
+    rng = random.Random(args.seed)
+    for user_id in range(1, 101):
+        schemas.ResumeData.model_validate(synthetic_resume(rng, user_id))
+
+    configurations = [("json, no owner index", "json", False), ("json", "json", True), ("gzip", "gzip", True)]
+    if database.zstandard is not None:
+        configurations.append(("zstd", "zstd", True))
+    print(f"{'configuration':<24}{'db MB':>10}{'load s':>9}{'read p50':>10}{'read p99':>10}{'write p50':>10}{'write p99':>10}  (ms)")
+    for label, storage_format, owner_index in configurations:
+        measure(label, storage_format, owner_index, args)
+
+if __name__ == "__main__":
+    main()
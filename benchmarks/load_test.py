@@ -0,0 +1,166 @@
+"""
+Concurrent load test for the backend API.
+
+Each virtual user signs up, logs in, then repeatedly exercises /resume/ and every /ai/* endpoint
+(including the streaming and job-queue variants). Latency percentiles and throughput are
+reported per endpoint. Run the backend against the fake LLM so no Gemini quota is used:
+
+    AI_BACKEND=fake FAKE_LLM_LATENCY_MS=800 FAKE_LLM_LATENCY_JITTER_MS=300 \
+    GEMINI_RATE_LIMIT_RPS=1000 GEMINI_RATE_LIMIT_BURST=1000 LLM_CACHE_ENABLED=0 \
+        uvicorn backend.main:app --workers 4
+
+    python -m benchmarks.load_test --users 50 --iterations 5
+
+Leave LLM_CACHE_ENABLED on to measure the cached path instead.
+"""
+import argparse
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+DEFAULT_PDF = os.path.join(os.path.dirname(__file__), "..", "frontend", "output", "resume.pdf")
+
+SAMPLE_RESUME = {
+    "name": "Load Test User",
+    "email": "loadtest@example.com",
+    "summary": "Engineer.",
+    "education": [{"degree": "B.E.", "institution": "Example Institute", "dates": "2021 - 2025", "grade_type": "CGPA", "grade_value": "9.0"}],
+    "projects": [{"title": "Tracker", "points": ["Built it."], "techStack": "Python", "repo_link": ""}],
+    "skills": [{"category": "Languages", "details": "Python, Java"}],
+}
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, name, seconds, ok):
+        with self._lock:
+            self.samples[name].append(seconds)
+            if not ok:
+                self.errors[name] += 1
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class VirtualUser:
+    def __init__(self, base_url, recorder, pdf_bytes, job_poll_timeout):
+        self.base_url = base_url.rstrip("/")
+        self.recorder = recorder
+        self.pdf_bytes = pdf_bytes
+        self.job_poll_timeout = job_poll_timeout
+        self.session = requests.Session()
+        self.email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+        self.password = "load-test-password"
+
+    def call(self, name, method, path, consume_stream=False, **kwargs):
+        started = time.perf_counter()
+        ok = False
+        response = None
+        try:
+            response = self.session.request(method, f"{self.base_url}{path}", stream=consume_stream, timeout=120, **kwargs)
+            if consume_stream:
+                for _ in response.iter_lines():
+                    pass
+            ok = response.status_code < 400
+        except requests.RequestException:
+            pass
+        self.recorder.record(name, time.perf_counter() - started, ok)
+        return response if ok else None
+
+    def login(self):
+        self.call("POST /signup", "post", "/signup", json={"email": self.email, "password": self.password})
+        response = self.call("POST /token", "post", "/token", data={"username": self.email, "password": self.password})
+        if response is None:
+            return False
+        self.session.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        return True
+
+    def iteration(self, n):
+        skills = SAMPLE_RESUME["skills"]
+        # Vary inputs per iteration so the response cache only helps where it would in real traffic.
+        skill_names = ["python", "java", "fastapi", f"tool-{n}"]
+        self.call("GET /resume/", "get", "/resume/")
+        self.call("PUT /resume/", "put", "/resume/", json=SAMPLE_RESUME)
+        self.call("PATCH /resume/", "patch", "/resume/", json={"summary": f"Engineer, revision {n}."})
+        self.call("POST /ai/categorize-skills/", "post", "/ai/categorize-skills/", json=skill_names)
+        self.call("POST /ai/generate-summary/", "post", "/ai/generate-summary/", json={"skills": skills, "job_description": f"Backend engineer {n}"})
+        self.call("POST /ai/generate-summary/stream/", "post", "/ai/generate-summary/stream/", consume_stream=True, json={"skills": skills, "job_description": f"Backend engineer {n}"})
+        self.call("POST /ai/suggest-projects/", "post", "/ai/suggest-projects/", json={"skills": skills})
+        self.call("POST /ai/suggest-projects/stream/", "post", "/ai/suggest-projects/stream/", consume_stream=True, json={"skills": skills})
+        self.call("POST /ai/analyze-github/", "post", "/ai/analyze-github/", json={"url": f"https://github.com/example/repo-{n}"})
+        files = {"file": ("resume.pdf", self.pdf_bytes, "application/pdf")}
+        self.call("POST /ai/parse-resume/", "post", "/ai/parse-resume/", files=files)
+        self.run_job()
+
+    def run_job(self):
+        """Queues a parse job and polls it to completion; recorded as one end-to-end sample."""
+        started = time.perf_counter()
+        files = {"file": ("resume.pdf", self.pdf_bytes, "application/pdf")}
+        response = self.call("POST /ai/jobs/parse-resume/", "post", "/ai/jobs/parse-resume/", files=files)
+        ok = False
+        if response is not None:
+            job_id = response.json()["job_id"]
+            while time.perf_counter() - started < self.job_poll_timeout:
+                polled = self.call("GET /ai/jobs/{id}", "get", f"/ai/jobs/{job_id}")
+                if polled is not None and polled.json()["status"] in ("done", "failed"):
+                    ok = polled.json()["status"] == "done"
+                    break
+                time.sleep(0.25)
+        self.recorder.record("job end-to-end", time.perf_counter() - started, ok)
+
+def run_user(base_url, recorder, pdf_bytes, iterations, job_poll_timeout):
+    user = VirtualUser(base_url, recorder, pdf_bytes, job_poll_timeout)
+    if not user.login():
+        return
+    for n in range(iterations):
+        user.iteration(n)
+
+def report(recorder, elapsed):
+    print(f"{'endpoint':<36}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}")
+    total = 0
+    for name in sorted(recorder.samples):
+        values = sorted(recorder.samples[name])
+        total += len(values)
+        print(f"{name:<36}{len(values):>7}{recorder.errors[name]:>8}"
+              f"{percentile(values, 50) * 1000:>10.1f}{percentile(values, 95) * 1000:>10.1f}{percentile(values, 99) * 1000:>10.1f}"
+              f"{len(values) / elapsed:>9.1f}")
+    print(f"\n{total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s overall)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=os.getenv("BACKEND_URL", "http://127.0.0.1:8000"))
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--iterations", type=int, default=3, help="request cycles per user")
+    parser.add_argument("--pdf", default=DEFAULT_PDF, help="PDF uploaded to the parse endpoints")
+    parser.add_argument("--job-poll-timeout", type=float, default=120.0)
+    parser.add_argument("--json", action="store_true", help="also dump raw samples as JSON")
+    args = parser.parse_args()
+
+    with open(args.pdf, "rb") as f:
+        pdf_bytes = f.read()
+
+    recorder = Recorder()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        for _ in range(args.users):
+            pool.submit(run_user, args.base_url, recorder, pdf_bytes, args.iterations, args.job_poll_timeout)
+    elapsed = time.perf_counter() - started
+
+    report(recorder, elapsed)
+    if args.json:
+        print(json.dumps({name: values for name, values in recorder.samples.items()}))
+
+if __name__ == "__main__":
+    main()
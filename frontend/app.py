@@ -1,8 +1,8 @@
 import streamlit as st
 import os
 import requests
-import base64
-from modules.resume_generator import generate_pdf
+import json
+from modules.resume_generator import render_pdf, render_preview
 
 # --- CONFIGURATION ---
 BACKEND_URL = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
@@ -42,18 +42,23 @@ def initialize_session_state():
     if 'resume_data' not in st.session_state: st.session_state.resume_data = {}
     if 'page' not in st.session_state: st.session_state.page = "Import Resume"
     if 'ai_suggestions' not in st.session_state: st.session_state.ai_suggestions = []
-    if 'pdf_preview' not in st.session_state: st.session_state.pdf_preview = None
+    if 'pdf_source' not in st.session_state: st.session_state.pdf_source = None
+    if 'saved_sections' not in st.session_state: st.session_state.saved_sections = {}
+    if 'resume_etag' not in st.session_state: st.session_state.resume_etag = None
 
 initialize_session_state()
 
 # --- API CLIENT FUNCTIONS ---
-def api_request(method, endpoint, json_data=None, files=None):
+def api_request(method, endpoint, json_data=None, files=None, extra_headers=None, allow_status=()):
     headers = {"Authorization": f"Bearer {st.session_state.token}"} if st.session_state.token else {}
+    headers.update(extra_headers or {})
     try:
         response = None
         if method.lower() == 'post': response = requests.post(f"{BACKEND_URL}{endpoint}", headers=headers, json=json_data, files=files)
         elif method.lower() == 'put': response = requests.put(f"{BACKEND_URL}{endpoint}", headers=headers, json=json_data)
+        elif method.lower() == 'patch': response = requests.patch(f"{BACKEND_URL}{endpoint}", headers=headers, json=json_data)
         elif method.lower() == 'get': response = requests.get(f"{BACKEND_URL}{endpoint}", headers=headers)
+        if response.status_code in allow_status: return response
         response.raise_for_status()
         return response
     except requests.exceptions.RequestException as e:
@@ -63,20 +68,58 @@ def api_request(method, endpoint, json_data=None, files=None):
             st.error(f"API request failed: {e}")
         return None
 
+def api_stream(endpoint, json_data=None):
+    """Yields (event, data) pairs from a server-sent events endpoint as they arrive."""
+    headers = {"Authorization": f"Bearer {st.session_state.token}"} if st.session_state.token else {}
+    try:
+        with requests.post(f"{BACKEND_URL}{endpoint}", headers=headers, json=json_data, stream=True) as response:
+            response.raise_for_status()
+            event = "message"
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    yield event, json.loads(line[len("data:"):].strip())
+    except requests.exceptions.RequestException as e:
+        if e.response is not None:
+            st.error(f"API Error ({e.response.status_code}): {e.response.json().get('detail', 'An error occurred.')}")
+        else:
+            st.error(f"API request failed: {e}")
+
 def fetch_resume_data():
-    response = api_request('get', '/resume/')
+    # A conditional GET: the backend answers 304 without loading the resume when nothing changed.
+    conditional = {"If-None-Match": st.session_state.resume_etag} if st.session_state.resume_etag and st.session_state.resume_data else None
+    response = api_request('get', '/resume/', extra_headers=conditional)
     if response and response.status_code == 200:
+        st.session_state.resume_etag = response.headers.get("ETag")
         st.session_state.resume_data = response.json()
+        # Snapshot what the server has before filling defaults, so the defaults get saved once.
+        st.session_state.saved_sections = section_snapshot(st.session_state.resume_data)
         for key in ['education', 'projects', 'internships', 'experience', 'skills', 'achievements', 'leadership']:
             if key not in st.session_state.resume_data or st.session_state.resume_data[key] is None:
                 st.session_state.resume_data[key] = []
         if 'section_order' not in st.session_state.resume_data or not st.session_state.resume_data['section_order']:
             st.session_state.resume_data['section_order'] = ["Summary", "Education", "Projects", "Skills", "Internship Experience", "Work Experience", "Achievements", "Activities & Leadership"]
 
+def section_snapshot(data):
+    return {key: json.dumps(value, sort_keys=True) for key, value in data.items()}
+
 def save_resume_data():
+    """Sends only the sections that changed since the last save; does nothing if none did."""
     if st.session_state.token:
-        response = api_request('put', '/resume/', json_data=st.session_state.resume_data)
-        if response and response.status_code == 200:
+        saved = st.session_state.saved_sections
+        changes = {key: value for key, value in st.session_state.resume_data.items() if saved.get(key) != json.dumps(value, sort_keys=True)}
+        if not changes:
+            return
+        conditional = {"If-Match": st.session_state.resume_etag} if st.session_state.resume_etag else None
+        response = api_request('patch', '/resume/', json_data=changes, extra_headers=conditional, allow_status=(409,))
+        if response and response.status_code == 409:
+            st.warning(f"{response.json().get('detail')} Your latest edits were not saved; the newest version has been loaded.")
+            st.session_state.resume_etag = None
+            fetch_resume_data()
+        elif response and response.status_code == 200:
+            st.session_state.resume_etag = response.headers.get("ETag")
+            saved.update(section_snapshot(changes))
             st.toast("Progress Saved!", icon="✅")
 
 # --- UI HELPER FUNCTIONS ---
@@ -142,7 +185,9 @@ def show_main_app_ui():
     if st.sidebar.button("Logout"):
         st.session_state.token = None
         st.session_state.resume_data = {}
-        st.session_state.pdf_preview = None
+        st.session_state.pdf_source = None
+        st.session_state.saved_sections = {}
+        st.session_state.resume_etag = None
         st.rerun()
 
     st.title(st.session_state.page)
@@ -231,12 +276,15 @@ def render_summary_page():
     if st.button("Generate Summary with AI"):
         if not st.session_state.resume_data.get('skills'): st.warning("Please add skills first.")
         else:
-            with st.spinner("AI is crafting your summary..."):
-                payload = {"skills": st.session_state.resume_data['skills'], "job_description": job_desc}
-                response = api_request('post', '/ai/generate-summary/', json_data=payload)
-                if response and response.status_code == 200:
-                    st.session_state.resume_data['summary'] = response.json().get('summary')
-                    st.toast("Summary generated!"); st.rerun()
+            payload = {"skills": st.session_state.resume_data['skills'], "job_description": job_desc}
+            def summary_tokens():
+                for event, data in api_stream('/ai/generate-summary/stream/', json_data=payload):
+                    if event == "token": yield data
+                    elif event == "error": st.error(data)
+            summary = st.write_stream(summary_tokens())
+            if isinstance(summary, str) and summary:
+                st.session_state.resume_data['summary'] = summary
+                st.toast("Summary generated!"); st.rerun()
 
 def render_education_page():
     st.header("🎓 Education")
@@ -281,9 +329,19 @@ def render_projects_page():
     if st.button("Suggest Projects"):
         if not st.session_state.resume_data.get('skills'): st.warning("Please add skills first.")
         else:
+            suggestions, live = [], st.empty()
             with st.spinner("AI is brainstorming..."):
-                resp = api_request('post', '/ai/suggest-projects/', json_data={"skills": st.session_state.resume_data['skills']})
-                if resp and resp.status_code == 200: st.session_state.ai_suggestions = resp.json(); st.toast("Suggestions loaded!")
+                for event, data in api_stream('/ai/suggest-projects/stream/', json_data={"skills": st.session_state.resume_data['skills']}):
+                    if event == "project":
+                        suggestions.append(data)
+                        with live.container():
+                            for proj in suggestions:
+                                with st.container(border=True):
+                                    st.write(f"**{proj.get('title','')}**")
+                                    st.write("\n".join([f"- {p}" for p in proj.get('description',[])])); st.write(f"**Tech:** {proj.get('tech_stack')}")
+                    elif event == "error": st.error(data)
+            live.empty()
+            if suggestions: st.session_state.ai_suggestions = suggestions; st.toast("Suggestions loaded!")
     if st.session_state.ai_suggestions:
         st.write("### AI Ideas (select to add/remove):")
         for i, proj in enumerate(st.session_state.ai_suggestions):
@@ -321,6 +379,16 @@ def render_achievements_and_leadership_page():
         act_text = st.text_input("Add new activity")
         if st.form_submit_button("Add Activity"): st.session_state.resume_data.setdefault('leadership',[]).append(act_text); st.toast("Activity added!"); st.rerun()
 
+# Rendering is keyed by the resume's canonical JSON, so reruns and repeat clicks on unchanged
+# data reuse the same PDF and preview. Streamlit serves both by URL rather than inlining them.
+@st.cache_data(max_entries=64, show_spinner=False)
+def build_resume_pdf(resume_json):
+    return render_pdf(json.loads(resume_json))
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def build_resume_preview(resume_json):
+    return render_preview(build_resume_pdf(resume_json))
+
 def render_generate_resume_page():
     st.header("🎉 Finalize and Download")
     
@@ -341,22 +409,21 @@ def render_generate_resume_page():
             if not any(st.session_state.resume_data.get(key_map[s]) for s in all_sections):
                 st.warning("Your resume is empty. Please add some information before generating the PDF.")
             else:
-                with st.spinner("Building your resume..."):
-                    pdf_path = generate_pdf(st.session_state.resume_data)
-                    with open(pdf_path, "rb") as f:
-                        base64_pdf = base64.b64encode(f.read()).decode('utf-8')
-                    st.session_state.pdf_preview = f'<iframe src="data:application/pdf;base64,{base64_pdf}" width="100%" height="800px" type="application/pdf"></iframe>'
+                # Only the canonical JSON is kept in the session; the PDF and preview live in the render cache.
+                st.session_state.pdf_source = json.dumps(st.session_state.resume_data, sort_keys=True)
 
     with col2:
-        if st.session_state.pdf_preview:
+        if st.session_state.pdf_source:
+            with st.spinner("Building your resume..."):
+                pdf_bytes = build_resume_pdf(st.session_state.pdf_source)
+                preview_png, page_count = build_resume_preview(st.session_state.pdf_source)
             st.subheader("Resume Preview")
-            st.markdown(st.session_state.pdf_preview, unsafe_allow_html=True)
-            pdf_path = "output/resume.pdf"
-            with open(pdf_path, "rb") as pdf_file:
-                PDFbyte = pdf_file.read()
+            if st.session_state.pdf_source != json.dumps(st.session_state.resume_data, sort_keys=True):
+                st.info("Your resume has changed since this preview. Generate it again to update.")
+            st.image(preview_png, caption=f"Page 1 of {page_count}", use_container_width=True)
             st.download_button(
                 label="Download Resume as PDF",
-                data=PDFbyte,
+                data=pdf_bytes,
                 file_name=f"{st.session_state.resume_data.get('name','resume').replace(' ','_')}_Resume.pdf",
                 mime="application/octet-stream",
                 use_container_width=True
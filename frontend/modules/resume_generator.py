@@ -1,4 +1,6 @@
 import os
+import threading
+from io import BytesIO
 from docx import Document
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
@@ -8,31 +10,74 @@ from templates.template1 import create_pradyumna_style_template
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfbase import pdfmetrics
 
-def generate_pdf(resume_data, output_path="output/resume.pdf"):
+# Resolution of the on-screen preview image; high enough to read, far smaller than the PDF as a data URI.
+PREVIEW_DPI = int(os.getenv("PREVIEW_DPI", "110"))
+
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets", "fonts")
+
+_fonts_registered = None
+_fonts_lock = threading.Lock()
+
+def register_fonts():
     """
-    Generates a PDF resume using ReportLab and a specified template function.
+    Registers the Roboto family with ReportLab once per process.
+    Returns True if the custom fonts are available, False if renders should fall back to Times.
     """
-    # Ensure the output directory exists
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    global _fonts_registered
+    if _fonts_registered is None:
+        with _fonts_lock:
+            if _fonts_registered is None:
+                try:
+                    pdfmetrics.registerFont(TTFont('Roboto', os.path.join(FONT_DIR, 'Roboto-Regular.ttf')))
+                    pdfmetrics.registerFont(TTFont('Roboto-Bold', os.path.join(FONT_DIR, 'Roboto-Bold.ttf')))
+                    pdfmetrics.registerFont(TTFont('Roboto-Italic', os.path.join(FONT_DIR, 'Roboto-Italic.ttf')))
+                    pdfmetrics.registerFontFamily('Roboto', normal='Roboto', bold='Roboto-Bold', italic='Roboto-Italic', boldItalic=None) # boldItalic not needed for this resume
+                    _fonts_registered = True
+                except Exception as e:
+                    print(f"Font Registration Error: {e}. Falling back to default fonts.")
+                    _fonts_registered = False
+    return _fonts_registered
 
-    doc = SimpleDocTemplate(output_path, pagesize=A4,
+def render_pdf(resume_data, output_path=None, use_custom_font=True):
+    """
+    Renders the resume into an in-memory buffer and returns the PDF bytes.
+    If output_path is given, the bytes are also written there.
+    """
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4,
                            topMargin=40, bottomMargin=40,
                            leftMargin=40, rightMargin=40)
 
-    try:
-        pdfmetrics.registerFont(TTFont('Roboto', 'assets/fonts/Roboto-Regular.ttf'))
-        pdfmetrics.registerFont(TTFont('Roboto-Bold', 'assets/fonts/Roboto-Bold.ttf'))
-        pdfmetrics.registerFont(TTFont('Roboto-Italic', 'assets/fonts/Roboto-Italic.ttf'))
-        pdfmetrics.registerFontFamily('Roboto', normal='Roboto', bold='Roboto-Bold', italic='Roboto-Italic', boldItalic=None) # boldItalic not needed for this resume
-        font_registered = True
-    except Exception as e:
-        print(f"Font Registration Error: {e}. Falling back to default fonts.")
-        font_registered = False
-    
     story = []
     
-    create_pradyumna_style_template(story, resume_data, use_custom_font=font_registered)
+    create_pradyumna_style_template(story, resume_data, use_custom_font=use_custom_font and register_fonts())
     
     doc.build(story)
-    print(f"PDF saved to {output_path}")
-    return output_path
\ No newline at end of file
+    pdf_bytes = buffer.getvalue()
+
+    if output_path:
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, "wb") as f:
+            f.write(pdf_bytes)
+        print(f"PDF saved to {output_path}")
+    return pdf_bytes
+
+def generate_pdf(resume_data, output_path="output/resume.pdf"):
+    """
+    Generates a PDF resume and writes it to output_path. Kept for file-based callers;
+    prefer render_pdf, which never touches the disk.
+    """
+    render_pdf(resume_data, output_path=output_path)
+    return output_path
+
+def render_preview(pdf_bytes, dpi=PREVIEW_DPI):
+    """
+    Rasterizes the first page of a rendered resume to PNG with PyMuPDF.
+    Returns (png_bytes, page_count).
+    """
+    try:
+        import pymupdf
+    except ImportError:
+        import fitz as pymupdf
+    with pymupdf.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return doc[0].get_pixmap(dpi=dpi).tobytes("png"), doc.page_count
@@ -2,12 +2,16 @@ from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_LEFT, TA_RIGHT,TA_CENTER
 from reportlab.lib import colors
+import threading
+from functools import lru_cache
 
-def create_pradyumna_style_template(story, data, use_custom_font=False):
-    # --- FONT & STYLE SETUP ---
-    base_font = 'Times-Roman'
-    bold_font = 'Times-Bold'
+# Styles depend only on the font choice, so they are built once per process and shared by
+# every render. ParagraphStyles are read-only while a document builds; flowables such as the
+# separator Table are not (they keep layout state), so only the separator's style is shared.
+_style_cache = {}
+_style_lock = threading.Lock()
 
+def _build_styles(base_font, bold_font):
     styles = getSampleStyleSheet()
     styles.add(ParagraphStyle(name='Name', fontName=bold_font, fontSize=16, alignment=TA_CENTER, spaceAfter=6, textColor=colors.black))
     styles.add(ParagraphStyle(name='ContactInfo', fontName=base_font, fontSize=9, alignment=TA_CENTER, spaceAfter=8))
@@ -19,12 +23,53 @@ def create_pradyumna_style_template(story, data, use_custom_font=False):
     styles.add(ParagraphStyle(name='EduDates', fontName=base_font, fontSize=10, alignment=TA_RIGHT))
     styles.add(ParagraphStyle(name='Degree', fontName=base_font, fontSize=10, leading=12, alignment=TA_LEFT))
     styles.add(ParagraphStyle(name='Grade', fontName=base_font, fontSize=10, leading=12, alignment=TA_RIGHT))
-    bullet_style = ParagraphStyle(name='Bullet', parent=styles['Normal'], fontName=base_font, fontSize=10, leftIndent=12, spaceBefore=0, leading=12, alignment=TA_LEFT)
+    styles.add(ParagraphStyle(name='ResumeBullet', parent=styles['Normal'], fontName=base_font, fontSize=10, leftIndent=12, spaceBefore=0, leading=12, alignment=TA_LEFT))
+    return styles
+
+def get_styles(use_custom_font=False):
+    """Returns the shared stylesheet for the given font choice, building it on first use."""
+    styles = _style_cache.get(use_custom_font)
+    if styles is None:
+        with _style_lock:
+            styles = _style_cache.get(use_custom_font)
+            if styles is None:
+                # The Roboto family must already be registered (see resume_generator.register_fonts).
+                fonts = ('Roboto', 'Roboto-Bold') if use_custom_font else ('Times-Roman', 'Times-Bold')
+                styles = _style_cache[use_custom_font] = _build_styles(*fonts)
+    return styles
+
+SEPARATOR_STYLE = TableStyle([('LINEBELOW', (0,0), (-1,-1), 0.3, colors.darkgrey), ('TOPPADDING', (0,0), (-1,-1), 0)])
+EDUCATION_STYLE = TableStyle([('VALIGN', (0,0), (-1,-1), 'TOP'), ('PADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,1), (-1,-1), 4)])
+
+# Parsing a paragraph's markup into frags is most of the cost of building the story, and
+# re-renders repeat almost every paragraph. The parse result is cached per (markup, style);
+# styles are the shared ones from get_styles, so their identity is a stable key. Flowables
+# themselves are never shared: ReportLab records layout state on them while a document builds
+# (e.g. _postponed), so each build gets a new Paragraph holding its own copies of the frags.
+PARAGRAPH_CACHE_MAX_ENTRIES = 4096
+
+@lru_cache(maxsize=PARAGRAPH_CACHE_MAX_ENTRIES)
+def _parse(markup, style):
+    parsed = Paragraph(markup, style)
+    return parsed.style, tuple(parsed.frags), parsed.bulletText
+
+def clear_paragraph_cache():
+    _parse.cache_clear()
+
+def para(markup, style):
+    """A new Paragraph for markup, parsed at most once per style."""
+    parsed_style, frags, bullet_text = _parse(markup, style)
+    return Paragraph(markup, parsed_style, bulletText=bullet_text, frags=[frag.clone() for frag in frags])
+
+def create_pradyumna_style_template(story, data, use_custom_font=False):
+    # --- FONT & STYLE SETUP ---
+    styles = get_styles(use_custom_font)
+    bullet_style = styles['ResumeBullet']
     
-    separator_line = Table([['']], colWidths=['100%'], style=[('LINEBELOW', (0,0), (-1,-1), 0.3, colors.darkgrey), ('TOPPADDING', (0,0), (-1,-1), 0)])
+    separator_line = Table([['']], colWidths=['100%'], style=SEPARATOR_STYLE)
 
     # --- HEADER ---
-    story.append(Paragraph(data.get('name', '').upper(), styles['Name']))
+    story.append(para(data.get('name', '').upper(), styles['Name']))
     contact_parts = []
     if data.get('email'): contact_parts.append(data.get('email'))
     if data.get('linkedin'): contact_parts.append(f'<a href="{data.get("linkedin")}" color="black">LinkedIn</a>')
@@ -32,12 +77,12 @@ def create_pradyumna_style_template(story, data, use_custom_font=False):
     if data.get('leetcode'): contact_parts.append(f'<a href="{data.get("leetcode")}" color="black">LeetCode</a>')
     if data.get('phone'): contact_parts.append(data.get('phone'))
     contact_line = " &nbsp;|&nbsp; ".join(contact_parts)
-    story.append(Paragraph(contact_line, styles['ContactInfo']))
+    story.append(para(contact_line, styles['ContactInfo']))
 
     # --- SECTION BUILDER ---
     def add_section(title, content_generator):
         story.append(Spacer(1, 8))
-        story.append(Paragraph(title, styles['SectionHeader']))
+        story.append(para(title, styles['SectionHeader']))
         story.append(separator_line)
         story.append(Spacer(1, 6))
         content_generator()
@@ -45,18 +90,16 @@ def create_pradyumna_style_template(story, data, use_custom_font=False):
     # --- DYNAMIC SECTION RENDERING ---
     
     def render_summary():
-        story.append(Paragraph(data.get('summary', ''), styles['Body']))
+        story.append(para(data.get('summary', ''), styles['Body']))
         
     def render_education():
         for edu in data.get('education', []):
             grade_type = edu.get('grade_type', 'CGPA') # Default to CGPA
             grade_value = edu.get('grade_value', '')
             grade_text = f"<b>{grade_type}:</b> {grade_value}" if grade_value else ""
-            table_data = [[Paragraph(edu.get('institution', ''), styles['Institution']), Paragraph(edu.get('dates', ''), styles['EduDates'])],
-                          [Paragraph(edu.get('degree', ''), styles['Degree']), Paragraph(grade_text, styles['Grade'])]]
-            tbl = Table(table_data, colWidths=['75%', '25%'])
-            tbl.setStyle(TableStyle([('VALIGN', (0,0), (-1,-1), 'TOP'), ('PADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,1), (-1,-1), 4)]))
-            story.append(tbl)
+            table_data = [[para(edu.get('institution', ''), styles['Institution']), para(edu.get('dates', ''), styles['EduDates'])],
+                          [para(edu.get('degree', ''), styles['Degree']), para(grade_text, styles['Grade'])]]
+            story.append(Table(table_data, colWidths=['75%', '25%'], style=EDUCATION_STYLE))
 
     def render_projects():
         for project in data.get('projects', []):
@@ -69,28 +112,28 @@ def create_pradyumna_style_template(story, data, use_custom_font=False):
             else:
                 formatted_title = f"<b>{full_title}</b>"
                 link_display_text = full_title
-            story.append(Paragraph(formatted_title, styles['ProjectTitle']))
-            for point in project.get('points', []): story.append(Paragraph(f"• {point}", bullet_style))
-            if project.get('techStack'): story.append(Paragraph(f"<b>Technologies:</b> {project.get('techStack')}", bullet_style))
-            if project.get('repo_link'): story.append(Paragraph(f'<a href="{project.get("repo_link")}" color="black">GitHub: {link_display_text}</a>', bullet_style))
+            story.append(para(formatted_title, styles['ProjectTitle']))
+            for point in project.get('points', []): story.append(para(f"• {point}", bullet_style))
+            if project.get('techStack'): story.append(para(f"<b>Technologies:</b> {project.get('techStack')}", bullet_style))
+            if project.get('repo_link'): story.append(para(f'<a href="{project.get("repo_link")}" color="black">GitHub: {link_display_text}</a>', bullet_style))
             story.append(Spacer(1, 10))
 
     def render_skills():
 
-        story.append(Paragraph("".join([f"<b>{s.get('category', '')}:</b> {s.get('details', '')}<br/>" for s in data.get('skills', [])]), styles['SkillsBody']))
+        story.append(para("".join([f"<b>{s.get('category', '')}:</b> {s.get('details', '')}<br/>" for s in data.get('skills', [])]), styles['SkillsBody']))
 
     def render_experience(experience_list):
         for item in experience_list:
             header = f"<b>{item.get('role', '')}</b> | {item.get('company', '')} | <i>{item.get('dates', '')}</i>"
-            story.append(Paragraph(header, styles['Body']))
-            for point in item.get('responsibilities', []): story.append(Paragraph(f"• {point}", bullet_style))
+            story.append(para(header, styles['Body']))
+            for point in item.get('responsibilities', []): story.append(para(f"• {point}", bullet_style))
             story.append(Spacer(1, 8))
 
     def render_achievements():
-        for ach in data.get('achievements'): story.append(Paragraph(f"• {ach}", bullet_style))
+        for ach in data.get('achievements'): story.append(para(f"• {ach}", bullet_style))
         
     def render_leadership():
-        for act in data.get('leadership'): story.append(Paragraph(f"• {act}", bullet_style))
+        for act in data.get('leadership'): story.append(para(f"• {act}", bullet_style))
 
     # Map section names to data keys and rendering functions
     section_map = {
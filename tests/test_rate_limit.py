@@ -0,0 +1,43 @@
+"""Classification of Gemini errors as rate limits."""
+from backend import fake_llm, rate_limit
+
+class StatusError(Exception):
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+class Response:
+    status_code = 429
+    headers = {"retry-after": "3"}
+
+class HTTPError(Exception):
+    response = Response()
+
+class ResourceExhausted(Exception):
+    pass
+
+def test_status_code_429_is_a_rate_limit():
+    assert rate_limit.is_rate_limit_error(StatusError("slow down", 429))
+    assert rate_limit.is_rate_limit_error(HTTPError("upstream said no"))
+    assert rate_limit.is_rate_limit_error(fake_llm.FakeRateLimitError("quota"))
+
+def test_rate_limit_error_types_match_without_a_status():
+    assert rate_limit.is_rate_limit_error(ResourceExhausted("quota"))
+
+def test_cause_is_checked():
+    try:
+        try:
+            raise StatusError("slow down", 429)
+        except StatusError as inner:
+            raise RuntimeError("chain failed") from inner
+    except RuntimeError as e:
+        assert rate_limit.is_rate_limit_error(e)
+
+def test_other_status_codes_ignore_the_message():
+    assert not rate_limit.is_rate_limit_error(StatusError("prompt used 4290 tokens; 429 in body", 500))
+    assert not rate_limit.is_rate_limit_error(StatusError("Quota exceeded for project", 403))
+
+def test_message_is_the_fallback_without_a_status():
+    assert rate_limit.is_rate_limit_error(ValueError("429 Resource has been exhausted"))
+    assert rate_limit.is_rate_limit_error(ValueError("RESOURCE_EXHAUSTED: quota"))
+    assert not rate_limit.is_rate_limit_error(ValueError("prompt used 4290 tokens"))
@@ -0,0 +1,75 @@
+"""Rendering tests for the resume PDF template and its paragraph cache."""
+import io
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+# The frontend modules import each other relative to frontend/, as they do under Streamlit.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "frontend"))
+
+from modules import resume_generator  # noqa: E402
+from templates import template1  # noqa: E402
+
+def multi_page_resume():
+    return {
+        "name": "Test Candidate",
+        "email": "candidate@example.com",
+        "summary": "Engineer with a long track record. " * 20,
+        "experience": [
+            {"role": f"Engineer {i}", "company": f"Company {i}", "dates": "2020 - 2024",
+             "responsibilities": [f"Delivered improvement {j} to a large production system with measurable impact." for j in range(6)]}
+            for i in range(8)
+        ],
+        "projects": [
+            {"title": f"Project {i}: Something useful", "techStack": "Python", "points": [f"Built part {j}." for j in range(4)]}
+            for i in range(6)
+        ],
+        "skills": [{"category": "Languages", "details": "Python, Java, SQL"}],
+    }
+
+def page_count(pdf_bytes):
+    return len(re.findall(rb"/Type\s*/Page[^s]", pdf_bytes))
+
+def test_same_multi_page_resume_renders_twice():
+    template1.clear_paragraph_cache()
+    data = multi_page_resume()
+    first = resume_generator.render_pdf(data)
+    second = resume_generator.render_pdf(data)
+    assert first.startswith(b"%PDF") and second.startswith(b"%PDF")
+    assert page_count(first) >= 2
+    assert page_count(second) == page_count(first)
+
+def style_snapshot(styles):
+    return {name: dict(styles[name].__dict__) for name in styles.byName}
+
+@pytest.mark.parametrize("use_custom_font", [False, True])
+def test_renders_share_styles_without_changing_them(use_custom_font):
+    data = multi_page_resume()
+    resume_generator.render_pdf(data, use_custom_font=use_custom_font)
+    styles = template1.get_styles(use_custom_font and resume_generator.register_fonts())
+    before = style_snapshot(styles)
+
+    template1.clear_paragraph_cache()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        pdfs = list(pool.map(lambda _: resume_generator.render_pdf(data, use_custom_font=use_custom_font), range(8)))
+
+    assert template1.get_styles(use_custom_font and resume_generator.register_fonts()) is styles
+    assert style_snapshot(styles) == before
+    assert len({page_count(pdf) for pdf in pdfs}) == 1
+
+def test_cached_paragraphs_render_identical_pages():
+    pypdf = pytest.importorskip("pypdf")
+    data = multi_page_resume()
+
+    def page_contents(pdf_bytes):
+        return [page.get_contents().get_data() for page in pypdf.PdfReader(io.BytesIO(pdf_bytes)).pages]
+
+    template1.clear_paragraph_cache()
+    cold = resume_generator.render_pdf(data)
+    warm = resume_generator.render_pdf(data)
+    assert page_contents(warm) == page_contents(cold)